@@ -0,0 +1,51 @@
+"""Micro-benchmark: precompiled glossary matcher vs. the per-term loop.
+
+    python benchmarks/bench_glossary.py [--segments 2000] [--repeat 5]
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notification_translator import glossary  # noqa: E402
+
+
+def legacy_apply_wind_glossary(text, lang):
+    for wrong, correct in glossary.WIND_GLOSSARY.get(lang, {}).items():
+        pattern = re.compile(re.escape(wrong), re.IGNORECASE | re.UNICODE)
+        def _replace(m, c=correct):
+            return c[0].upper() + c[1:] if m.group(0)[0].isupper() else c
+        text = pattern.sub(_replace, text)
+    return text
+
+
+def make_segments(lang, count):
+    terms = list(glossary.WIND_GLOSSARY[lang])
+    filler = "the technician reported the event during the inspection of"
+    return [
+        f"{filler} {terms[i % len(terms)]} and {terms[(i * 7) % len(terms)].capitalize()} #{i}"
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--segments", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'lang':<6} {'legacy ms':>10} {'compiled ms':>12} {'speedup':>8}")
+    for lang in glossary.WIND_GLOSSARY:
+        segments = make_segments(lang, args.segments)
+        legacy = min(timeit.repeat(
+            lambda: [legacy_apply_wind_glossary(s, lang) for s in segments], number=1, repeat=args.repeat))
+        compiled = min(timeit.repeat(
+            lambda: [glossary.apply_wind_glossary(s, lang) for s in segments], number=1, repeat=args.repeat))
+        print(f"{lang:<6} {legacy * 1000:>10.1f} {compiled * 1000:>12.1f} {legacy / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
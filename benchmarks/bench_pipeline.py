@@ -0,0 +1,209 @@
+"""End-to-end DOCX pipeline benchmark against a latency-injecting mock translator.
+
+    python benchmarks/bench_pipeline.py --paragraphs 400 --latency 0.15 --error-rate 0.02 --targets de,es
+    python benchmarks/bench_pipeline.py --input notification.docx --json results.json
+    python benchmarks/bench_pipeline.py --input big_manual.docx --streaming --latency 0
+    python benchmarks/bench_pipeline.py --input big_manual.docx --part-workers 8 --latency 0 --repeat 3
+"""
+import argparse
+from functools import partial
+from io import BytesIO
+import json
+import os
+import random
+import resource
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document  # noqa: E402
+
+from notification_translator import (  # noqa: E402
+    LocalBackend,
+    TokenBucket,
+    extract_document,
+    lock_table_layout,
+    part_pool,
+    stream_texts,
+    stream_write,
+    translate_batch_multi,
+    write_segments,
+)
+from notification_translator.parallel import parallel_texts, render_parts, write_rendered  # noqa: E402
+from synthetic_docx import build_notification  # noqa: E402
+
+
+class MockBackend(LocalBackend):
+    name = "mock"
+
+    def __init__(self, latency=0.0, error_rate=0.0, seed=1):
+        super().__init__(latency)
+        self.error_rate = error_rate
+        self.calls = 0
+        self.chars = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._stats_lock = threading.Lock()
+
+    def translate(self, text, target, source="auto"):
+        with self._stats_lock:
+            self.calls += 1
+            self.chars += len(text)
+            failed = self._rng.random() < self.error_rate
+            self.errors += failed
+        if failed:
+            if self.latency:
+                time.sleep(self.latency)
+            raise ConnectionError("injected translator failure")
+        return super().translate(text, target, source)
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_pipeline(data, targets, backend, max_in_flight, rate):
+    stages = {}
+
+    t = time.perf_counter()
+    doc = Document(BytesIO(data))
+    stages["parse"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    segments = extract_document(doc)
+    stages["extract"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    translations = translate_batch_multi(segments.texts(), targets, backend=backend,
+                                         limiter=TokenBucket(rate) if rate else None,
+                                         max_in_flight=max_in_flight)
+    stages["translate"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    for tbl in segments.tables:
+        lock_table_layout(tbl)
+    stages["layout"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    for code in targets:
+        write_segments(segments, translations[code])
+        doc.save(BytesIO())
+    stages["save"] = time.perf_counter() - t
+    return len(segments), stages
+
+
+def run_streaming_pipeline(data, targets, backend, max_in_flight, rate):
+    stages = {}
+
+    t = time.perf_counter()
+    texts = stream_texts(BytesIO(data))
+    stages["extract"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    translations = translate_batch_multi(texts, targets, backend=backend,
+                                         limiter=TokenBucket(rate) if rate else None,
+                                         max_in_flight=max_in_flight)
+    stages["translate"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    for code in targets:
+        stream_write(BytesIO(data), BytesIO(), dict(zip(texts, translations[code])))
+    stages["save"] = time.perf_counter() - t
+    return len(texts), stages
+
+
+def run_parallel_pipeline(data, targets, backend, max_in_flight, rate, pool):
+    stages = {}
+
+    t = time.perf_counter()
+    parts, texts_by_part, texts = parallel_texts(BytesIO(data), pool)
+    stages["extract"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    translations = translate_batch_multi(texts, targets, backend=backend,
+                                         limiter=TokenBucket(rate) if rate else None,
+                                         max_in_flight=max_in_flight)
+    stages["translate"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    rendered = render_parts(parts, texts_by_part, {code: dict(zip(texts, translations[code])) for code in targets},
+                            pool)
+    for code in targets:
+        write_rendered(BytesIO(data), BytesIO(), rendered[code])
+    stages["save"] = time.perf_counter() - t
+    return len(texts), stages
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", help="benchmark an existing .docx instead of a synthetic one")
+    parser.add_argument("--paragraphs", type=int, default=200)
+    parser.add_argument("--tables", type=int, default=10)
+    parser.add_argument("--table-rows", type=int, default=8)
+    parser.add_argument("--sections", type=int, default=3)
+    parser.add_argument("--textboxes", type=int, default=10)
+    parser.add_argument("--sdts", type=int, default=10)
+    parser.add_argument("--images", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds per mock translator call")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--targets", default="de")
+    parser.add_argument("--in-flight", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=0.0, help="requests/s limit (0 = unlimited)")
+    parser.add_argument("--streaming", action="store_true", help="use the low-memory streaming pipeline")
+    parser.add_argument("--part-workers", type=int, default=0,
+                        help="process the XML parts on this many worker processes (first repeat includes start-up)")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--json", help="write results to this path")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, "rb") as fh:
+            data = fh.read()
+    else:
+        data = build_notification(args.paragraphs, args.tables, args.table_rows, args.sections,
+                                  args.textboxes, args.sdts, args.images)
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+
+    pool = part_pool(args.part_workers) if args.part_workers > 0 else None
+    if pool is not None:
+        pipeline = partial(run_parallel_pipeline, pool=pool)
+    else:
+        pipeline = run_streaming_pipeline if args.streaming else run_pipeline
+    runs = []
+    for i in range(args.repeat):
+        backend = MockBackend(args.latency, args.error_rate, seed=i + 1)
+        start = time.perf_counter()
+        segment_count, stages = pipeline(data, targets, backend, args.in_flight, args.rate)
+        total = time.perf_counter() - start
+        runs.append({
+            "segments": segment_count,
+            "targets": len(targets),
+            "seconds": round(total, 4),
+            "segments_per_sec": round(segment_count * len(targets) / total, 1),
+            "translator_calls": backend.calls,
+            "translator_errors": backend.errors,
+            "chars_sent": backend.chars,
+            "stages": {k: round(v, 4) for k, v in stages.items()},
+        })
+    if pool is not None:
+        pool.shutdown()
+    result = {"document_bytes": len(data), "peak_rss_mb": round(peak_rss_mb(), 1), "runs": runs}
+
+    best = min(runs, key=lambda r: r["seconds"])
+    print(f"document        {len(data) / 1024:.0f} KiB, {best['segments']} segments x {best['targets']} targets")
+    print(f"total           {best['seconds']:.3f}s  ({best['segments_per_sec']} segments/s)")
+    print(f"translator      {best['translator_calls']} calls, {best['chars_sent']} chars, "
+          f"{best['translator_errors']} injected errors")
+    for stage, seconds in best["stages"].items():
+        print(f"  {stage:<13} {seconds:.4f}s")
+    print(f"peak RSS        {result['peak_rss_mb']} MiB")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Cold-start and per-rerun cost of the Streamlit app and the translation package.
+
+    python benchmarks/bench_startup.py [--repeat 5] [--reruns 20] [--json startup.json]
+
+Each cold measurement runs in a fresh interpreter so nothing is served from sys.modules.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("docx", "lxml", "requests", "bs4", "deep_translator")
+
+# Names streamlit_app.py pulls from the package on every cold start.
+PACKAGE_IMPORT = """
+import json, sys, time
+start = time.perf_counter()
+from notification_translator import (FAILED, WIND_GLOSSARY, JobManager, JobMetrics, ResultCache, TokenBucket,
+    TranslationMemory, iter_translate, language_labels, languages, part_pool, plan_docx, target_codes,
+    translate_docx_job, translate_revision_job)
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "heavy": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+# What the first DOCX job pays on its worker thread once the package itself is loaded.
+DEFERRED_IMPORT = """
+import json, time
+import notification_translator
+start = time.perf_counter()
+import notification_translator.docx_pipeline, notification_translator.streaming, notification_translator.revision
+import requests, bs4, deep_translator
+print(json.dumps({"seconds": time.perf_counter() - start}))
+"""
+
+APP_RUN = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+streamlit_seconds = time.perf_counter() - start
+at = AppTest.from_file(%r, default_timeout=60)
+start = time.perf_counter()
+at.run()
+first = time.perf_counter() - start
+assert not at.exception, at.exception
+reruns = []
+for _ in range(%d):
+    start = time.perf_counter()
+    at.run()
+    reruns.append(time.perf_counter() - start)
+print(json.dumps({"streamlit_seconds": streamlit_seconds, "first_run": first, "reruns": reruns}))
+"""
+
+
+def run_python(code, env):
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--reruns", type=int, default=20, help="script reruns per app session")
+    parser.add_argument("--skip-app", action="store_true", help="only measure the package imports")
+    parser.add_argument("--json", help="write results to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "PYTHONPATH": ROOT, "TRANSLATION_MEMORY_PATH": os.path.join(tmp, "tm.sqlite3")}
+        imports = [run_python(PACKAGE_IMPORT, env) for _ in range(args.repeat)]
+        deferred = [run_python(DEFERRED_IMPORT, env) for _ in range(args.repeat)]
+        apps = [] if args.skip_app else [
+            run_python(APP_RUN % (os.path.join(ROOT, "streamlit_app.py"), args.reruns), env)
+            for _ in range(args.repeat)
+        ]
+
+    result = {
+        "package_import_ms": ms(statistics.median(r["seconds"] for r in imports)),
+        "heavy_modules_at_import": imports[0]["heavy"],
+        "deferred_import_ms": ms(statistics.median(r["seconds"] for r in deferred)),
+    }
+    if apps:
+        result.update({
+            "streamlit_import_ms": ms(statistics.median(r["streamlit_seconds"] for r in apps)),
+            "app_first_run_ms": ms(statistics.median(r["first_run"] for r in apps)),
+            "app_rerun_ms": ms(statistics.median(statistics.median(r["reruns"]) for r in apps)),
+        })
+
+    print(f"package import   {result['package_import_ms']} ms  "
+          f"(heavy modules loaded: {', '.join(result['heavy_modules_at_import']) or 'none'})")
+    print(f"deferred imports {result['deferred_import_ms']} ms  (paid by the first DOCX job)")
+    if apps:
+        print(f"streamlit import {result['streamlit_import_ms']} ms")
+        print(f"app first run    {result['app_first_run_ms']} ms")
+        print(f"app rerun        {result['app_rerun_ms']} ms  (median of {args.reruns})")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Check that the DOM, streaming and parallel DOCX pipelines produce the same document.
+
+    python benchmarks/check_pipelines.py [--input notification.docx] [--targets de,es] [--part-workers 2]
+
+Each output is read back with python-docx and its extracted segments are compared; the parallel
+output must also be byte-identical to the streaming one. Exits non-zero on the first mismatch.
+"""
+import argparse
+from io import BytesIO
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document  # noqa: E402
+
+from notification_translator import (  # noqa: E402
+    LocalBackend,
+    extract_document,
+    part_pool,
+    render_translations,
+    stream_texts,
+    stream_write,
+    translate_batch_multi,
+)
+from notification_translator.parallel import parallel_texts, render_parts, write_rendered  # noqa: E402
+from synthetic_docx import build_notification  # noqa: E402
+
+
+def dom_outputs(data, targets, backend):
+    doc = Document(BytesIO(data))
+    segments = extract_document(doc)
+    translations = translate_batch_multi(segments.texts(), targets, backend=backend)
+    return dict(render_translations(doc, segments, translations))
+
+
+def streaming_outputs(data, targets, backend):
+    texts = stream_texts(BytesIO(data))
+    translations = translate_batch_multi(texts, targets, backend=backend)
+    outputs = {}
+    for code in targets:
+        output = BytesIO()
+        stream_write(BytesIO(data), output, dict(zip(texts, translations[code])))
+        outputs[code] = output.getvalue()
+    return outputs
+
+
+def parallel_outputs(data, targets, backend, pool):
+    parts, texts_by_part, texts = parallel_texts(BytesIO(data), pool)
+    translations = translate_batch_multi(texts, targets, backend=backend)
+    rendered = render_parts(parts, texts_by_part, {code: dict(zip(texts, translations[code])) for code in targets},
+                            pool)
+    outputs = {}
+    for code in targets:
+        output = BytesIO()
+        write_rendered(BytesIO(data), output, rendered[code])
+        outputs[code] = output.getvalue()
+    return outputs
+
+
+def document_texts(data):
+    return extract_document(Document(BytesIO(data))).texts()
+
+
+def compare(name, expected, actual):
+    if expected == actual:
+        return
+    index = next((i for i, (a, b) in enumerate(zip(expected, actual)) if a != b), min(len(expected), len(actual)))
+    raise SystemExit(f"{name}: segment {index} differs ({len(expected)} vs {len(actual)} segments)\n"
+                     f"  expected {expected[index] if index < len(expected) else None!r}\n"
+                     f"  actual   {actual[index] if index < len(actual) else None!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", help="check an existing .docx instead of the synthetic one")
+    parser.add_argument("--targets", default="de,es")
+    parser.add_argument("--part-workers", type=int, default=2)
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, "rb") as fh:
+            data = fh.read()
+    else:
+        data = build_notification()
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+    backend = LocalBackend()
+
+    dom = dom_outputs(data, targets, backend)
+    streaming = streaming_outputs(data, targets, backend)
+    pool = part_pool(args.part_workers)
+    try:
+        parallel = parallel_outputs(data, targets, backend, pool)
+    finally:
+        pool.shutdown()
+
+    for code in targets:
+        expected = document_texts(dom[code])
+        compare(f"{code} streaming vs DOM", expected, document_texts(streaming[code]))
+        if parallel[code] != streaming[code]:
+            raise SystemExit(f"{code} parallel output is not byte-identical to the streaming output")
+        print(f"{code:<4} {len(expected)} segments match (DOM, streaming, parallel)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Synthetic HSE notification generator for the benchmark suite.
+
+Builds a .docx with glossary-heavy body text, merged-cell tables, several
+sections with their own headers/footers, DrawingML text boxes, block-level
+content controls and inline images, sized by the counts passed in.
+"""
+import base64
+from io import BytesIO
+import random
+
+from docx import Document
+from docx.oxml import parse_xml
+from docx.shared import Inches
+
+PNG_1PX = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8BQDwAEhQGAhKmMIQAAAABJRU5ErkJggg=="
+)
+
+SENTENCES = [
+    "Near miss reported at WTG {n} during blade inspection of the nacelle.",
+    "The technician noticed a loose bolt on the hub while the wind turbine was in yaw.",
+    "Notification IN.{id} raised after the gearbox oil temperature exceeded limits at {mw} MW.",
+    "Commissioning of the array cable was paused following the IEC 61400-{n} review.",
+    "Crane lifting operations at the monopile stopped due to wind speeds of {ms} m/s.",
+    "A fatal accident risk was identified in the substation; corrective action is pending.",
+    "Pitch control fault recorded at {rpm} rpm; DNV-GL surveyor informed per ISO 9001.",
+    "The wind farm site manager confirmed mechanical completion of the jacket structure.",
+]
+HEADERS = ["Date", "Location", "Category", "Severity", "Owner", "Status"]
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+TEXTBOX_XML = (
+    '<w:r xmlns:w="{w}" xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"'
+    ' xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+    ' xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape">'
+    '<w:drawing><wp:inline><wp:extent cx="3000000" cy="600000"/><wp:docPr id="{id}" name="Text Box {id}"/>'
+    '<a:graphic><a:graphicData uri="http://schemas.microsoft.com/office/word/2010/wordprocessingShape">'
+    '<wps:wsp><wps:cNvSpPr txBox="1"/><wps:spPr/><wps:txbx><w:txbxContent>{paras}</w:txbxContent></wps:txbx>'
+    '<wps:bodyPr/></wps:wsp></a:graphicData></a:graphic></wp:inline></w:drawing></w:r>'
+)
+SDT_XML = (
+    '<w:sdt xmlns:w="{w}"><w:sdtPr><w:alias w:val="{alias}"/><w:tag w:val="{alias}"/></w:sdtPr>'
+    '<w:sdtContent>{paras}</w:sdtContent></w:sdt>'
+)
+
+
+def _sentence(rng, n):
+    return rng.choice(SENTENCES).format(
+        n=n, id=rng.randint(10 ** 7, 10 ** 9), mw=rng.choice([2, 3.6, 8, 15]),
+        ms=rng.randint(12, 25), rpm=rng.randint(8, 16),
+    )
+
+
+def _runs_xml(rng, n):
+    words = _sentence(rng, n).split(" ")
+    cut = rng.randint(1, len(words) - 1)
+    return (
+        f'<w:p><w:r><w:t xml:space="preserve">{" ".join(words[:cut])} </w:t></w:r>'
+        f'<w:r><w:rPr><w:b/></w:rPr><w:t>{" ".join(words[cut:])}</w:t></w:r></w:p>'
+    )
+
+
+def _add_paragraph(doc, rng, n):
+    words = _sentence(rng, n).split(" ")
+    cut = rng.randint(1, len(words) - 1)
+    para = doc.add_paragraph(" ".join(words[:cut]) + " ")
+    para.add_run(" ".join(words[cut:])).bold = True
+    return para
+
+
+def _add_table(container, rng, rows, n, **kwargs):
+    table = container.add_table(rows=rows, cols=len(HEADERS), **kwargs)
+    for col, title in enumerate(HEADERS):
+        table.cell(0, col).text = title
+    for row in range(1, rows):
+        for col in range(len(HEADERS)):
+            table.cell(row, col).text = _sentence(rng, n + row) if col == 2 else f"{rng.randint(1, 99)}"
+    if rows > 3:
+        table.cell(1, 0).merge(table.cell(1, 1)).text = "Merged: " + _sentence(rng, n)
+        table.cell(2, 5).merge(table.cell(rows - 1, 5)).text = "Vertically merged status"
+    return table
+
+
+def build_notification(paragraphs=200, tables=10, table_rows=8, sections=3,
+                       textboxes=10, sdts=10, images=5, seed=1):
+    rng = random.Random(seed)
+    doc = Document()
+    body = doc.element.body
+    for s in range(sections):
+        section = doc.sections[0] if s == 0 else doc.add_section()
+        for hdr in (section.header, section.footer, section.first_page_header):
+            hdr.is_linked_to_previous = False
+            hdr.paragraphs[0].text = f"HSE notification · section {s + 1} · " + _sentence(rng, s)
+        section.different_first_page_header_footer = True
+        _add_table(section.header, rng, 2, s, width=Inches(6))
+        per_section = max(paragraphs // sections, 1)
+        for i in range(per_section):
+            _add_paragraph(doc, rng, i)
+            if tables and i % max(per_section * sections // tables, 1) == 0:
+                _add_table(doc, rng, table_rows, i)
+            if textboxes and i % max(per_section * sections // textboxes, 1) == 1:
+                paras = "".join(_runs_xml(rng, i) for _ in range(2))
+                doc.add_paragraph()._p.append(parse_xml(TEXTBOX_XML.format(w=W_NS, id=1000 + i * 10 + s, paras=paras)))
+            if sdts and i % max(per_section * sections // sdts, 1) == 2:
+                paras = "".join(_runs_xml(rng, i) for _ in range(2))
+                body.insert(len(body) - 1, parse_xml(SDT_XML.format(w=W_NS, alias=f"Field{i}", paras=paras)))
+            if images and i % max(per_section * sections // images, 1) == 3:
+                doc.add_paragraph("Figure: ").add_run().add_picture(BytesIO(PNG_1PX), width=Inches(0.5))
+    output = BytesIO()
+    doc.save(output)
+    return output.getvalue()
+
+
+if __name__ == "__main__":
+    import sys
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "synthetic_notification.docx"
+    with open(path, "wb") as fh:
+        fh.write(build_notification())
+    print(path)
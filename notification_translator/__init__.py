@@ -0,0 +1,49 @@
+from importlib import import_module
+
+# Bound eagerly: the name shadows its own submodule, which lazy lookup would return instead.
+from .languages import language_labels, languages, target_codes
+
+# Exported names are resolved on first access so importing the package stays cheap:
+# docx, lxml, requests and bs4 are only loaded once a pipeline that needs them runs.
+_EXPORTS = {
+    "backends": ("GoogleBackend", "LocalBackend", "TranslatorBackend", "get_backend"),
+    "cache": ("ResultCache", "content_digest", "result_key"),
+    "detect": ("detect_language", "is_linguistic"),
+    "docx_pipeline": (
+        "Segment",
+        "SegmentTable",
+        "extract_document",
+        "lock_table_layout",
+        "render_translations",
+        "translate_paragraph",
+        "translate_xml_runs",
+        "write_segments",
+        "zip_outputs",
+    ),
+    "glossary": ("PRESERVE_PATTERNS", "WIND_GLOSSARY", "apply_wind_glossary", "protect_text", "restore_text"),
+    "jobs": ("DONE", "FAILED", "QUEUED", "RUNNING", "Job", "JobManager", "translate_docx_job",
+             "translate_revision_job"),
+    "memory": ("TranslationMemory",),
+    "metrics": ("JobMetrics", "ProgressTracker"),
+    "parallel": ("part_pool", "translate_docx_parallel"),
+    "planner": ("plan_docx", "plan_translation"),
+    "revision": ("PriorTranslationMemory", "align_translations", "revision_report"),
+    "streaming": ("stream_texts", "stream_write", "translate_docx_stream"),
+    "translate": ("TokenBucket", "iter_translate", "safe_translate", "split_text", "translate_batch",
+                  "translate_batch_multi"),
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+__all__ = sorted([*_MODULES, "language_labels", "languages", "target_codes"])
+
+
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
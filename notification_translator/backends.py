@@ -0,0 +1,139 @@
+import os
+import threading
+import time
+
+from .resilience import CircuitBreaker
+
+TRANSLATOR_BACKEND = os.environ.get("TRANSLATOR_BACKEND", "google")
+TRANSLATE_MAX_IN_FLIGHT = int(os.environ.get("TRANSLATE_MAX_IN_FLIGHT", "8"))
+LATENCY_EWMA_WEIGHT = 0.2
+
+
+class TranslatorBackend:
+    name = "base"
+    char_limit = 5000
+
+    def __init__(self):
+        self.breaker = CircuitBreaker()
+        self.observed_latency = None
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def client(self, source, target):
+        key = (source, target)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._clients[key] = self.create_client(source, target)
+        return client
+
+    def create_client(self, source, target):
+        raise NotImplementedError
+
+    def observe_latency(self, seconds):
+        with self._lock:
+            if self.observed_latency is None:
+                self.observed_latency = seconds
+            else:
+                self.observed_latency += LATENCY_EWMA_WEIGHT * (seconds - self.observed_latency)
+
+    def translate(self, text, target, source="auto"):
+        return self.client(source, target).translate(text)
+
+
+class GoogleClient:
+    def __init__(self, backend, source, target):
+        self.backend = backend
+        self.params = {"sl": source, "tl": target}
+
+    def translate(self, text):
+        from bs4 import BeautifulSoup
+        from deep_translator.constants import BASE_URLS
+        from deep_translator.exceptions import NotValidLength, RequestError, TooManyRequests, TranslationNotFound
+
+        text = text.strip()
+        if not text:
+            return text
+        if len(text) > self.backend.char_limit:
+            raise NotValidLength(text, 0, self.backend.char_limit)
+        response = self.backend.session().get(
+            BASE_URLS["GOOGLE_TRANSLATE"], params={**self.params, "q": text}, timeout=self.backend.timeout,
+        )
+        if response.status_code == 429:
+            raise TooManyRequests()
+        if response.status_code in (413, 414):
+            raise NotValidLength(text, 0, self.backend.char_limit)
+        if response.status_code != 200:
+            raise RequestError()
+        soup = BeautifulSoup(response.text, "html.parser")
+        element = soup.find("div", {"class": "t0"}) or soup.find("div", {"class": "result-container"})
+        if not element:
+            raise TranslationNotFound(text)
+        return element.get_text(strip=True)
+
+
+class GoogleBackend(TranslatorBackend):
+    name = "google"
+
+    def __init__(self, timeout=30):
+        super().__init__()
+        self.timeout = timeout
+        self._session = None
+
+    def session(self):
+        # One session for the backend's lifetime: translation pools are created per call, so per-thread
+        # sessions would never outlive a batch. The adapter keeps up to TRANSLATE_MAX_IN_FLIGHT connections.
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=TRANSLATE_MAX_IN_FLIGHT)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def create_client(self, source, target):
+        return GoogleClient(self, source, target)
+
+
+class LocalClient:
+    def __init__(self, backend, target):
+        self.backend = backend
+        self.target = target
+
+    def translate(self, text):
+        if self.backend.latency:
+            time.sleep(self.backend.latency)
+        return "\n".join(f"[{self.target}] {line}" if line.strip() else line for line in text.split("\n"))
+
+
+class LocalBackend(TranslatorBackend):
+    name = "local"
+
+    def __init__(self, latency=0.0):
+        super().__init__()
+        self.latency = latency
+
+    def create_client(self, source, target):
+        return LocalClient(self, target)
+
+
+BACKENDS = {"google": GoogleBackend, "local": LocalBackend}
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def get_backend(name=None):
+    name = name or TRANSLATOR_BACKEND
+    with _instances_lock:
+        if name not in _instances:
+            if name not in BACKENDS:
+                raise ValueError(f"Unknown translator backend: {name!r}")
+            _instances[name] = BACKENDS[name]()
+        return _instances[name]
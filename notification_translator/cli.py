@@ -0,0 +1,238 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import glob
+import json
+import os
+import sys
+import time
+
+from docx import Document
+
+from .backends import BACKENDS, TRANSLATOR_BACKEND, get_backend
+from .docx_pipeline import extract_document, render_translations
+from .languages import languages
+from .memory import TranslationMemory
+from .metrics import JobMetrics
+from .parallel import part_pool, translate_docx_parallel
+from .planner import plan_docx
+from .streaming import translate_docx_stream
+from .translate import TRANSLATE_RATE_PER_SEC, TokenBucket, translate_batch_multi
+
+_worker = {}
+
+
+def expand_inputs(patterns):
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(glob.glob(os.path.join(pattern, "*.docx")))
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        paths.extend(m for m in matches if not os.path.basename(m).startswith("~$"))
+    return list(dict.fromkeys(paths))
+
+
+def parse_targets(values):
+    known = set(languages.values())
+    targets = []
+    for value in values:
+        for code in value.split(","):
+            code = code.strip()
+            if code not in known:
+                raise SystemExit(f"Unknown target language code: {code!r}")
+            targets.append(code)
+    return list(dict.fromkeys(targets))
+
+
+def output_stems(paths, output_dir):
+    # Mirror each input's path below the inputs' common directory, so same-named files from different
+    # folders cannot overwrite each other.
+    paths = {path: os.path.abspath(path) for path in paths}
+    base = os.path.commonpath([os.path.dirname(p) for p in paths.values()])
+    stems, seen = {}, {}
+    for path, absolute in paths.items():
+        stem = os.path.join(output_dir, os.path.splitext(os.path.relpath(absolute, base))[0])
+        key = os.path.normcase(stem)
+        if key in seen:
+            raise SystemExit(f"Output collision: {seen[key]!r} and {path!r} would both write {stem}.*.docx")
+        seen[key] = path
+        stems[path] = stem
+    return stems
+
+
+def _init_worker(rate, use_memory, backend, streaming=False, part_workers=0):
+    _worker["streaming"] = streaming or part_workers > 0
+    _worker["part_pool"] = part_pool(part_workers) if part_workers > 0 else None
+    _worker["backend"] = get_backend(backend)
+    _worker["limiter"] = TokenBucket(rate)
+    _worker["memory"] = TranslationMemory() if use_memory else None
+
+
+def translate_file_streaming(path, targets, stem):
+    start = time.perf_counter()
+    metrics = JobMetrics()
+    os.makedirs(os.path.dirname(stem), exist_ok=True)
+    outputs = {code: f"{stem}.{code}.docx" for code in targets}
+    handles = {code: open(out_path, "wb") for code, out_path in outputs.items()}
+    kwargs = {"pool": _worker["part_pool"]} if _worker.get("part_pool") else {}
+    translate = translate_docx_parallel if kwargs else translate_docx_stream
+    try:
+        texts = translate(path, handles, memory=_worker.get("memory"), limiter=_worker.get("limiter"),
+                          backend=_worker.get("backend"), metrics=metrics, **kwargs)
+    finally:
+        for fh in handles.values():
+            fh.close()
+    return {
+        "file": path,
+        "segments": len(texts),
+        "chars": sum(len(t) for t in texts),
+        "seconds": round(time.perf_counter() - start, 3),
+        "outputs": list(outputs.values()),
+        "metrics": metrics.to_dict(),
+    }
+
+
+def translate_file(path, targets, stem):
+    if _worker.get("streaming"):
+        return translate_file_streaming(path, targets, stem)
+    start = time.perf_counter()
+    metrics = JobMetrics()
+    with metrics.stage("parse"):
+        doc = Document(path)
+    with metrics.stage("extract"):
+        segments = extract_document(doc)
+    texts = segments.texts()
+    with metrics.stage("translate"):
+        translations = translate_batch_multi(texts, targets, memory=_worker.get("memory"),
+                                             limiter=_worker.get("limiter"), backend=_worker.get("backend"),
+                                             metrics=metrics)
+    os.makedirs(os.path.dirname(stem), exist_ok=True)
+    outputs = []
+    for code, data in render_translations(doc, segments, translations, metrics):
+        out_path = f"{stem}.{code}.docx"
+        with open(out_path, "wb") as fh:
+            fh.write(data)
+        outputs.append(out_path)
+    return {
+        "file": path,
+        "segments": len(texts),
+        "chars": sum(len(t) for t in texts),
+        "seconds": round(time.perf_counter() - start, 3),
+        "outputs": outputs,
+        "metrics": metrics.to_dict(),
+    }
+
+
+def _collect(path, result):
+    try:
+        result = result()
+    except Exception as exc:
+        result = {"file": path, "error": f"{type(exc).__name__}: {exc}"}
+    print(json.dumps(result, ensure_ascii=False), file=sys.stderr)
+    return result
+
+
+def run(paths, targets, output_dir, jobs, use_memory=True, backend=TRANSLATOR_BACKEND, streaming=False,
+        part_workers=0):
+    stems = output_stems(paths, output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+    files = []
+    if part_workers > 0:
+        # Files go one at a time through this process; their parts fan out to the shared part pool instead.
+        _init_worker(TRANSLATE_RATE_PER_SEC, use_memory, backend, part_workers=part_workers)
+        try:
+            for path in paths:
+                files.append(_collect(path, lambda: translate_file(path, targets, stems[path])))
+        finally:
+            _worker["part_pool"].shutdown()
+    else:
+        rate = TRANSLATE_RATE_PER_SEC / jobs if TRANSLATE_RATE_PER_SEC > 0 else 0
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(rate, use_memory, backend, streaming)) as pool:
+            futures = {pool.submit(translate_file, path, targets, stems[path]): path for path in paths}
+            for future in as_completed(futures):
+                files.append(_collect(futures[future], future.result))
+    files.sort(key=lambda r: paths.index(r["file"]))
+    done = [r for r in files if "error" not in r]
+    return {
+        "targets": targets,
+        "files": files,
+        "totals": {
+            "files": len(done),
+            "failed": len(files) - len(done),
+            "segments": sum(r["segments"] for r in done),
+            "chars": sum(r["chars"] for r in done),
+            "seconds": round(time.perf_counter() - start, 3),
+        },
+    }
+
+
+def plan(paths, targets, use_memory=True, backend=TRANSLATOR_BACKEND, streaming=False):
+    memory = TranslationMemory() if use_memory else None
+    backend = get_backend(backend)
+    limiter = TokenBucket(TRANSLATE_RATE_PER_SEC)
+    files = []
+    for path in paths:
+        with open(path, "rb") as fh:
+            data = fh.read()
+        files.append({"file": path, **plan_docx(data, targets, streaming, memory, limiter, backend)})
+    return {
+        "targets": targets,
+        "files": files,
+        "totals": {
+            "files": len(files),
+            "segments": sum(r["segments"] for r in files),
+            "unique_segments": sum(r["unique_segments"] for r in files),
+            "requests": sum(r["requests"] for r in files),
+            "chars_to_send": sum(r["chars_to_send"] for r in files),
+            "estimated_seconds": round(sum(r["estimated_seconds"] for r in files), 1),
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m notification_translator",
+        description="Translate .docx notifications headlessly.",
+    )
+    parser.add_argument("inputs", nargs="+", help=".docx files, directories or glob patterns")
+    parser.add_argument("-t", "--target", action="append", required=True,
+                        help="target language code(s), repeatable or comma separated")
+    parser.add_argument("-o", "--output-dir", default="translated")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--summary", help="summary JSON path (default: <output-dir>/summary.json)")
+    parser.add_argument("--no-memory", action="store_true", help="do not use the translation memory")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=TRANSLATOR_BACKEND,
+                        help="translator backend ('local' needs no network)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="low-memory mode: stream the XML parts instead of loading the document")
+    parser.add_argument("--part-workers", type=int, default=0, metavar="N",
+                        help="process each document's XML parts on N worker processes (files run one at a time)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="print the cost plan (segments, characters, requests, duration) without translating")
+    args = parser.parse_args(argv)
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        parser.error("no .docx files matched")
+    targets = parse_targets(args.target)
+    if args.dry_run:
+        print(json.dumps(plan(paths, targets, use_memory=not args.no_memory, backend=args.backend,
+                              streaming=args.streaming or args.part_workers > 0), ensure_ascii=False, indent=2))
+        return 0
+    summary = run(paths, targets, args.output_dir, max(1, args.jobs),
+                  use_memory=not args.no_memory, backend=args.backend, streaming=args.streaming,
+                  part_workers=args.part_workers)
+
+    summary_path = args.summary or os.path.join(args.output_dir, "summary.json")
+    with open(summary_path, "w", encoding="utf-8") as fh:
+        json.dump(summary, fh, ensure_ascii=False, indent=2)
+    print(json.dumps(summary["totals"]))
+    return 1 if summary["totals"]["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
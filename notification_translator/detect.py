@@ -0,0 +1,88 @@
+import re
+
+from .glossary import PRESERVE_RE
+
+DETECT_SAMPLE_WORDS = 2000
+DETECT_MIN_HITS = 10
+DETECT_MIN_RATIO = 1.8
+
+SCRIPTS = [
+    ("el", re.compile(r"[Ͱ-Ͽ]")),
+    ("ar", re.compile(r"[؀-ۿ]")),
+    ("hi", re.compile(r"[ऀ-ॿ]")),
+    ("gu", re.compile(r"[઀-૿]")),
+    ("ta", re.compile(r"[஀-௿]")),
+    ("te", re.compile(r"[ఀ-౿]")),
+    ("kn", re.compile(r"[ಀ-೿]")),
+    ("ml", re.compile(r"[ഀ-ൿ]")),
+    ("ko", re.compile(r"[가-힯]")),
+    ("ja", re.compile(r"[぀-ヿ]")),
+]
+CJK_RE = re.compile(r"[一-鿿]")
+LATIN_RE = re.compile(r"[A-Za-zÀ-ɏ]")
+
+STOPWORDS = {
+    "en": "the and of to a in is it was with for on at by this that are were from has have not be",
+    "de": "der die das und in ist nicht mit von den dem ein eine auf für wurde zu im sich des bei",
+    "es": "de el la los las del y que en un por con una para es se fue al lo como más está",
+    "fr": "de le la les des et en un est une du dans pour que qui sur pas au avec il ce sont été",
+    "it": "il di che è la a in un per una del della con non sono gli alla nel dei le stato anche",
+    "pt": "o a os as de do da que em um uma para com não foi no na dos é são",
+    "nl": "de het een en van is dat op te zijn niet met voor werd aan bij ook er door naar",
+    "pl": "i w z na się nie do jest że to o od przez dla jak po był oraz przy ze",
+    "cs": "a v se na je že s z do o k to není byl jsou pro při jako by od",
+    "da": "og i at er en det til af på med for ikke den som har de var blev fra et",
+    "sv": "och i att är en det som på för med av till inte den har var om ett vid blev",
+    "fi": "ja on ei että oli se tai kun mutta myös ovat tämä sekä kanssa joka ole olla hän niin vain",
+    "et": "ja on ei et see oli ka kui või aga mis ning seda kes olid selle siis tema veel üle",
+    "lt": "ir yra kad su į iš ne buvo tai o bet kaip per už jo apie nuo dėl prie arba",
+    "hr": "i je u na se da za su od s ne kao iz bio ali koji što ili biti te",
+    "ro": "și de la în a cu nu este pe din o că un pentru care mai fost sunt au",
+    "tr": "ve bir bu da de için ile olarak çok daha gibi ama olan en kadar değil sonra var ya ne",
+    "af": "die en van is het nie in wat op te vir met dat word sy was aan ook deur hulle",
+    "ga": "an na agus ar is i le go sé tá ag do a bhí seo sin ní leis mar níos",
+    "tl": "ang ng sa na mga ay at si ni para hindi ito kay may siya din rin lang po ako",
+}
+STOPWORD_SETS = {lang: frozenset(words.split()) for lang, words in STOPWORDS.items()}
+# A word shared by several lists ("de", "la", "a") splits its vote between them, so closely related
+# languages are told apart by the words only one of them uses.
+STOPWORD_WEIGHTS = {
+    lang: {w: 1 / sum(w in other for other in STOPWORD_SETS.values()) for w in stopwords}
+    for lang, stopwords in STOPWORD_SETS.items()
+}
+WORD_RE = re.compile(r"[^\W\d_]+")
+
+UNIT_RE = re.compile(r"\d\s*(?:MW|kW|kV|MWh|kWh|GWh|Hz|rpm|m/s|km/h|°C|°F|mm|cm|km|kg|kN|Nm|bar|psi|h|min|s|m|t|%)(?!\w)")
+DATE_RE = re.compile(r"\b\d{1,2}[./-]\d{1,2}[./-]\d{2,4}\b|\b\d{4}-\d{2}-\d{2}(?:T[\d:.]+Z?)?\b")
+
+
+def is_linguistic(text):
+    text = PRESERVE_RE.sub(" ", text)
+    text = DATE_RE.sub(" ", text)
+    text = UNIT_RE.sub(" ", text)
+    return WORD_RE.search(text) is not None
+
+
+def detect_language(texts, sample_words=DETECT_SAMPLE_WORDS):
+    words, script_hits, cjk, latin = [], {}, 0, 0
+    for text in texts:
+        for lang, pattern in SCRIPTS:
+            hits = len(pattern.findall(text))
+            if hits:
+                script_hits[lang] = script_hits.get(lang, 0) + hits
+        cjk += len(CJK_RE.findall(text))
+        latin += len(LATIN_RE.findall(text))
+        words.extend(w.lower() for w in WORD_RE.findall(text))
+        if len(words) >= sample_words:
+            break
+    if script_hits:
+        lang, hits = max(script_hits.items(), key=lambda item: item[1])
+        return lang if hits >= DETECT_MIN_HITS and hits >= DETECT_MIN_RATIO * latin else None
+    if cjk > latin:
+        return None
+    scores = sorted(((sum(weights.get(w, 0) for w in words), lang) for lang, weights in STOPWORD_WEIGHTS.items()),
+                    reverse=True)
+    (best, lang), (runner_up, _) = scores[0], scores[1]
+    if best >= DETECT_MIN_HITS and best >= DETECT_MIN_RATIO * max(runner_up, 1):
+        return lang
+    return None
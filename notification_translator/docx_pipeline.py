@@ -0,0 +1,257 @@
+from contextlib import nullcontext
+from io import BytesIO
+import re
+import zipfile
+
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml.ns import qn
+
+from .translate import translate_batch
+
+W_P, W_R, W_RPR = qn("w:p"), qn("w:r"), qn("w:rPr")
+W_TBL, W_TR, W_TC = qn("w:tbl"), qn("w:tr"), qn("w:tc")
+W_SDT, W_SDT_CONTENT, W_TXBX_CONTENT = qn("w:sdt"), qn("w:sdtContent"), qn("w:txbxContent")
+W_VAL = qn("w:val")
+# Run content that write-back can rebuild from text; any other child (fields, note and comment
+# references, drawings) pins its run in place.
+TEXT_RUN_CHILDREN = {qn(f"w:{tag}") for tag in ("rPr", "t", "tab", "br", "cr")}
+BLOCK_TAGS = (W_P, W_TBL, W_SDT)
+RUN_WRAPPERS = tuple(qn(f"w:{tag}") for tag in ("hyperlink", "ins", "smartTag", "fldSimple", "customXml", "moveTo",
+                                                 "dir", "bdo"))
+NOTE_TAGS = (qn("w:footnote"), qn("w:endnote"))
+VML_NS = "urn:schemas-microsoft-com:vml"
+IMAGE_TAGS = (qn("w:drawing"), f"{{{VML_NS}}}imagedata", qn("w:pict"), f"{{{VML_NS}}}shape")
+ON_OFF_FALSE = {"0", "false", "off"}
+PLAIN_FMT = (None,) * 7
+
+
+class Segment:
+    __slots__ = ("text", "targets", "fmt", "part", "written")
+
+    def __init__(self, text, targets, fmt, part):
+        self.text = text
+        self.targets = targets
+        self.fmt = fmt
+        self.part = part
+        self.written = text
+
+
+class SegmentTable:
+    __slots__ = ("segments", "tables")
+
+    def __init__(self):
+        self.segments = []
+        self.tables = []
+
+    def add(self, targets, fmt, part):
+        text = "".join(t.text or "" for t in targets)
+        if text.strip():
+            self.segments.append(Segment(text, targets, fmt, part))
+
+    def texts(self):
+        return [seg.text for seg in self.segments]
+
+    def __len__(self):
+        return len(self.segments)
+
+
+def element_has_image(xml_element):
+    for tag in IMAGE_TAGS:
+        if next(xml_element.iter(tag), None) is not None:
+            return True
+    return False
+
+
+def _rpr_val(rPr, tag, attr=W_VAL):
+    el = rPr.find(qn(tag))
+    return None if el is None else el.get(attr)
+
+
+def _rpr_on_off(rPr, tag):
+    el = rPr.find(qn(tag))
+    return None if el is None else el.get(W_VAL) not in ON_OFF_FALSE
+
+
+def run_fmt_key(r):
+    # Same shape with or without rPr: Word splits runs on proofing and language tags, which must not
+    # split a sentence.
+    rPr = r.find(W_RPR)
+    if rPr is None:
+        return PLAIN_FMT
+    return (_rpr_on_off(rPr, "w:b"), _rpr_on_off(rPr, "w:i"), _rpr_val(rPr, "w:u"),
+            _rpr_val(rPr, "w:sz"), _rpr_val(rPr, "w:rFonts", qn("w:ascii")), _rpr_val(rPr, "w:color"),
+            _rpr_val(rPr, "w:rStyle"))
+
+
+def is_text_run(r):
+    return all(child.tag in TEXT_RUN_CHILDREN for child in r)
+
+
+def extract_runs(container, part, table):
+    # Groups never span a wrapper boundary, so a translation cannot move text into or out of a hyperlink
+    # or tracked change; deleted text (w:del, w:moveFrom) is left alone.
+    group, key = [], None
+    for child in container.iterchildren(W_R, W_SDT, *RUN_WRAPPERS):
+        if child.tag != W_R or not is_text_run(child):
+            if group:
+                table.add(group, key, part)
+            group, key = [], None
+            if child.tag == W_SDT:
+                content = child.find(W_SDT_CONTENT)
+                if content is not None:
+                    extract_runs(content, part, table)
+            elif child.tag != W_R:
+                extract_runs(child, part, table)
+            continue
+        fmt = run_fmt_key(child)
+        if group and fmt != key:
+            table.add(group, key, part)
+            group = []
+        group.append(child)
+        key = fmt
+    if group:
+        table.add(group, key, part)
+
+
+def extract_paragraph(p, part, table):
+    if not element_has_image(p):
+        extract_runs(p, part, table)
+    for content in p.iter(W_TXBX_CONTENT):
+        if next(content.iterancestors(W_P)) is p:
+            extract_content(content, part, table)
+
+
+def extract_content(el, part, table):
+    for child in el:
+        if child.tag in BLOCK_TAGS:
+            extract_block(child, part, table, nested=True)
+        elif child.tag != W_R:
+            extract_content(child, part, table)
+
+
+def extract_xml_runs(xml_element, part, table):
+    if xml_element.tag in BLOCK_TAGS:
+        extract_block(xml_element, part, table, nested=True)
+    else:
+        extract_content(xml_element, part, table)
+
+
+def iter_own(owner, tag):
+    for el in owner.iter(tag):
+        if next(el.iterancestors(owner.tag)) is owner:
+            yield el
+
+
+def extract_block(block, part, table, nested=False):
+    if block.tag == W_P:
+        extract_paragraph(block, part, table)
+    elif block.tag == W_TBL:
+        if not nested:
+            table.tables.append(block)
+        for tc in iter_own(block, W_TC):
+            extract_content(tc, part, table)
+    elif block.tag == W_SDT:
+        content = block.find(W_SDT_CONTENT)
+        if content is not None:
+            extract_content(content, part, table)
+    elif block.tag in NOTE_TAGS:
+        for child in block.iterchildren(*BLOCK_TAGS):
+            extract_block(child, part, table)
+
+
+def extract_part(root, part, table):
+    for block in root.iterchildren():
+        extract_block(block, part, table)
+
+
+def iter_story_parts(doc):
+    yield doc.element.body, str(doc.part.partname)
+    for rel in doc.part.rels.values():
+        if not rel.is_external and rel.reltype in (RT.HEADER, RT.FOOTER):
+            yield rel.target_part.element, str(rel.target_part.partname)
+
+
+def extract_document(doc):
+    table = SegmentTable()
+    for root, part in iter_story_parts(doc):
+        extract_part(root, part, table)
+    return table
+
+
+def write_segments(table, translations):
+    for seg, translated in zip(table.segments, translations):
+        if translated == seg.written:
+            continue
+        seg.targets[0].text = translated
+        for target in seg.targets[1:]:
+            target.text = ""
+        seg.written = translated
+
+
+def translate_paragraph(para, target_lang):
+    table = SegmentTable()
+    extract_paragraph(para._p, None, table)
+    write_segments(table, translate_batch(table.texts(), target_lang))
+
+
+def translate_xml_runs(xml_element, target_lang):
+    table = SegmentTable()
+    extract_xml_runs(xml_element, None, table)
+    write_segments(table, translate_batch(table.texts(), target_lang))
+
+
+def lock_table_layout(tbl):
+    from lxml import etree
+    tblPr = tbl.find(qn("w:tblPr"))
+    if tblPr is None:
+        tblPr = etree.SubElement(tbl, qn("w:tblPr"))
+    tblLayout = tblPr.find(qn("w:tblLayout"))
+    if tblLayout is None:
+        tblLayout = etree.SubElement(tblPr, qn("w:tblLayout"))
+    tblLayout.set(qn("w:type"), "fixed")
+    for tr in iter_own(tbl, W_TR):
+        trPr = tr.find(qn("w:trPr"))
+        if trPr is None:
+            trPr = etree.SubElement(tr, qn("w:trPr"))
+        trHeight = trPr.find(qn("w:trHeight"))
+        if trHeight is None:
+            h_val = "567"
+            trHeight = etree.SubElement(trPr, qn("w:trHeight"))
+            trHeight.set(qn("w:val"), h_val)
+        trHeight.set(qn("w:hRule"), "exact")
+        for tc in iter_own(tr, W_TC):
+            tcPr = tc.find(qn("w:tcPr"))
+            if tcPr is None:
+                tcPr = etree.SubElement(tc, qn("w:tcPr"))
+            tcW = tcPr.find(qn("w:tcW"))
+            if tcW is not None:
+                tcW.set(qn("w:type"), "dxa")
+            else:
+                tcW = etree.SubElement(tcPr, qn("w:tcW"))
+                tcW.set(qn("w:w"), "2000")
+                tcW.set(qn("w:type"), "dxa")
+
+
+def render_translations(doc, segments, translations, metrics=None):
+    with metrics.stage("layout") if metrics else nullcontext():
+        for tbl in segments.tables:
+            lock_table_layout(tbl)
+    for code, texts in translations.items():
+        with metrics.stage("save") if metrics else nullcontext():
+            write_segments(segments, texts)
+            output = BytesIO()
+            doc.save(output)
+        yield code, output.getvalue()
+
+
+def output_name(label):
+    safe_name = re.sub(r'[^\w\-]', '_', label)
+    return f"translated_{safe_name}.docx"
+
+
+def zip_outputs(outputs):
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in outputs.items():
+            zf.writestr(name, data)
+    return buffer.getvalue()
@@ -0,0 +1,189 @@
+from functools import lru_cache
+import hashlib
+import json
+import re
+
+WIND_GLOSSARY = {
+    "es": {
+        "cuchillas": "palas", "cuchilla": "pala", "aspas": "palas", "aspa": "pala",
+        "paletas": "palas", "paleta": "pala", "hoja": "pala", "hojas": "palas",
+        "veletas": "palas", "veleta": "pala", "cabina": "góndola",
+        "multiplicador": "multiplicadora", "caja de cambios": "multiplicadora",
+        "caja de velocidades": "multiplicadora", "cubo": "buje", "centro": "buje",
+        "turbina de viento": "aerogenerador", "molino de viento": "aerogenerador",
+        "generador eólico": "aerogenerador", "parque de viento": "parque eólico",
+        "granja eólica": "parque eólico", "granja de viento": "parque eólico",
+        "control de cabeceo": "control de paso", "control de inclinación": "control de paso",
+        "guiñada": "orientación", "puesta en servicio": "puesta en marcha",
+        "comisionamiento": "puesta en marcha", "puesta en funcionamiento": "puesta en marcha",
+        "terminación mecánica": "finalización mecánica",
+        "accidente fatal": "accidente mortal", "cuasi accidente": "cuasi-accidente",
+        "casi accidente": "cuasi-accidente", "estación secundaria": "subestación",
+        "cable de arreglo": "cable de interconexión", "pilote único": "monopilote",
+        "chaqueta": "estructura de celosía", "guindaste": "grúa",
+    },
+    "pl": {
+        "skrzydła": "łopaty", "skrzydło": "łopata", "łopatki": "łopaty", "łopatka": "łopata",
+        "wiatrak": "turbina wiatrowa", "park wiatrowy": "farma wiatrowa",
+        "farma wiatrakowa": "farma wiatrowa", "skrzynia biegów": "przekładnia",
+        "przekładnia zębata": "przekładnia", "kabina": "gondola", "piasta koła": "piasta",
+        "oddanie do eksploatacji": "uruchomienie", "kąt skoku": "skok",
+        "kąt łopaty": "skok", "ster": "odchylenie",
+        "prawie wypadek": "zdarzenie potencjalnie wypadkowe", "dźwig": "żuraw",
+    },
+    "de": {
+        "blätter": "Rotorblätter", "flügel": "Rotorblätter", "rotorflügel": "Rotorblätter",
+        "schaufeln": "Rotorblätter", "schaufel": "Rotorblatt",
+        "windmühle": "Windkraftanlage", "windrad": "Windkraftanlage",
+        "windturbine": "Windkraftanlage", "windfarm": "Windpark",
+        "windgenerator": "Windkraftanlage", "kabine": "Gondel", "radnabe": "Nabe",
+        "zahnradgetriebe": "Getriebe", "inbetriebsetzung": "Inbetriebnahme",
+        "azimutwinkel": "Azimut", "gierwinkel": "Azimut",
+        "blattanstellwinkel": "Blattwinkel", "anstellwinkel": "Blattwinkel",
+        "beinahunfall": "Beinaheunfall", "einzelpfahl": "Monopfahl",
+    },
+    "fr": {
+        "lames": "pales", "ailes": "pales", "aile": "pale",
+        "turbine éolienne": "éolienne", "moulin à vent": "éolienne",
+        "ferme éolienne": "parc éolien", "ferme de vent": "parc éolien",
+        "boîte de vitesses": "multiplicateur", "transmission": "multiplicateur",
+        "cabine": "nacelle", "centre": "moyeu", "commissionning": "mise en service",
+        "lacet": "orientation", "pieu unique": "monopieu",
+        "accident fatal": "accident mortel", "presque accident": "quasi-accident",
+    },
+    "it": {
+        "lame": "pale", "turbina eolica": "aerogeneratore",
+        "mulino a vento": "aerogeneratore", "fattoria eolica": "parco eolico",
+        "scatola del cambio": "moltiplicatore", "trasmissione": "moltiplicatore",
+        "cabina": "navicella", "messa in funzione": "messa in servizio",
+        "incidente fatale": "incidente mortale", "quasi incidente": "quasi-incidente",
+    },
+    "nl": {
+        "bladen": "rotorbladen", "blad": "rotorblad", "vleugels": "rotorbladen",
+        "windmolen": "windturbine", "tandwielkast": "versnellingsbak",
+        "cabine": "gondel", "spoedregeling": "bladhoekregeling",
+        "fataal ongeluk": "dodelijk ongeluk",
+    },
+    "pt": {
+        "lâminas": "pás", "turbina eólica": "aerogerador",
+        "moinho de vento": "aerogerador", "fazenda eólica": "parque eólico",
+        "caixa de engrenagens": "multiplicadora", "transmissão": "multiplicadora",
+        "cabine": "nacele", "posta em serviço": "entrada em operação",
+        "comissionamento": "entrada em operação",
+    },
+    "sv": {
+        "blad": "rotorblad", "vingar": "rotorblad", "vinge": "rotorblad",
+        "vindturbin": "vindkraftverk", "vindmölla": "vindkraftverk",
+        "kugghjulsväxel": "växellåda", "kabin": "gondol",
+        "driftsättning": "idrifttagning", "stegkontroll": "bladvinkelreglering",
+    },
+    "da": {
+        "blade": "rotorblade", "vinger": "rotorblade",
+        "vindkraftværk": "vindmølle", "vindpark": "vindmøllepark",
+        "kabine": "nacelle", "pitchkontrol": "pitchregulering",
+    },
+    "fi": {
+        "lavat": "roottorin lavat", "lapa": "roottorin lapa",
+        "tuuliturbiini": "tuulivoimala", "tuulimylly": "tuulivoimala",
+        "hajautus": "suuntaus",
+    },
+    "ja": {
+        "刃": "ブレード", "羽根": "ブレード", "翼": "ブレード",
+        "風力タービン": "風力発電機", "風車": "風力発電機",
+        "風力団地": "ウインドファーム", "ギアボックス": "増速機",
+        "変速機": "増速機", "キャビン": "ナセル", "致命的事故": "死亡事故",
+        "ニアミス": "ヒヤリハット",
+    },
+    "ko": {
+        "날": "블레이드", "날개": "블레이드", "풍력 터빈": "풍력 발전기",
+        "풍차": "풍력 발전기", "풍력 단지": "풍력 발전 단지",
+        "기어박스": "증속기", "요": "요잉", "아찔한 순간": "아차 사고",
+    },
+    "zh-CN": {
+        "刀片": "叶片", "刀": "叶片", "桨叶": "叶片",
+        "风力涡轮机": "风力发电机", "风车": "风力发电机",
+        "风电农场": "风电场", "风能农场": "风电场", "变速箱": "齿轮箱",
+        "试运行": "调试", "致命事故": "死亡事故", "险兆": "未遂事故", "吊车": "起重机",
+    },
+    "zh-TW": {
+        "刀片": "葉片", "刀": "葉片", "風力渦輪機": "風力發電機",
+        "風車": "風力發電機", "風電農場": "風電場", "試運行": "調試", "致命事故": "死亡事故",
+    },
+}
+
+PRESERVE_PATTERNS = [
+    r'\bIN\.\d{7,12}\b',
+    r'\b\d+(?:\.\d+)?\s*(?:MW|kW|m/s|rpm|Hz|kV|MWh|kWh)\b',
+    r'\bIEC\s*\d+[-\w]*\b',
+    r'\bISO\s*\d+\b',
+    r'\bDNV[-\s]\w+\b',
+    r'\bVAS\w*\b',
+]
+
+
+@lru_cache(maxsize=None)
+def glossary_version(lang):
+    payload = json.dumps([WIND_GLOSSARY.get(lang, {}), PRESERVE_PATTERNS], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def compile_wind_glossary(glossary):
+    matchers = {}
+    for lang, terms in glossary.items():
+        lookup = {wrong.lower(): correct for wrong, correct in terms.items()}
+        for correct in terms.values():
+            lookup.setdefault(correct.lower(), None)
+        alternation = "|".join(re.escape(term) for term in sorted(lookup, key=len, reverse=True))
+        matchers[lang] = (re.compile(alternation, re.IGNORECASE | re.UNICODE), lookup)
+    return matchers
+
+
+GLOSSARY_MATCHERS = compile_wind_glossary(WIND_GLOSSARY)
+
+
+def apply_wind_glossary_counted(text, lang):
+    matcher = GLOSSARY_MATCHERS.get(lang)
+    if matcher is None:
+        return text, 0
+    pattern, lookup = matcher
+    replaced = 0
+
+    def _replace(m):
+        nonlocal replaced
+        found = m.group(0)
+        correct = lookup.get(found.lower())
+        if correct is None:
+            return found
+        replaced += 1
+        return correct[0].upper() + correct[1:] if found[0].isupper() else correct
+    return pattern.sub(_replace, text), replaced
+
+
+def apply_wind_glossary(text, lang):
+    return apply_wind_glossary_counted(text, lang)[0]
+
+
+PRESERVE_RE = re.compile("|".join(f"(?:{pat})" for pat in PRESERVE_PATTERNS))
+PLACEHOLDER_RE = re.compile(r"_{1,2}\s*PH\s*(\d+)\s*_{1,2}", re.IGNORECASE)
+
+
+def protect_text(text):
+    tokens = {}
+
+    def _protect(m):
+        original = m.group(0)
+        token = tokens.get(original)
+        if token is None:
+            token = tokens[original] = f"__PH{len(tokens)}__"
+        return token
+    text = PRESERVE_RE.sub(_protect, text)
+    return text, {token: original for original, token in tokens.items()}
+
+
+def restore_text(text, placeholders):
+    if not placeholders:
+        return text
+
+    def _restore(m):
+        return placeholders.get(f"__PH{m.group(1)}__", m.group(0))
+    return PLACEHOLDER_RE.sub(_restore, text)
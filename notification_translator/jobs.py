@@ -0,0 +1,198 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+import os
+import threading
+import time
+import uuid
+
+from .backends import get_backend
+from .cache import content_digest, result_key
+from .metrics import JobMetrics, ProgressTracker
+from .translate import translate_batch_multi
+
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+JOB_RESULT_TTL = float(os.environ.get("JOB_RESULT_TTL", "3600"))
+JOB_MAX_RETAINED = int(os.environ.get("JOB_MAX_RETAINED", "20"))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+class Job:
+    __slots__ = ("id", "status", "progress", "details", "result", "error", "metrics",
+                 "created", "started", "finished", "_finished")
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.status = QUEUED
+        self.progress = ProgressTracker()
+        self.details = {}
+        self.result = None
+        self.error = None
+        self.metrics = JobMetrics()
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._finished = threading.Event()
+
+    @property
+    def active(self):
+        return self.status in (QUEUED, RUNNING)
+
+    def wait(self, timeout=None):
+        return self._finished.wait(timeout)
+
+
+class JobManager:
+    def __init__(self, workers=JOB_WORKERS, ttl=JOB_RESULT_TTL, max_retained=JOB_MAX_RETAINED):
+        self.ttl = ttl
+        self.max_retained = max_retained
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="translation-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        job = Job()
+        with self._lock:
+            self._evict()
+            self._jobs[job.id] = job
+        self._pool.submit(self._run, job, fn, args, kwargs)
+        return job.id
+
+    def get(self, job_id):
+        with self._lock:
+            self._evict()
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return {
+            "active": sum(job.active for job in jobs),
+            "retained": sum(not job.active for job in jobs),
+        }
+
+    def _run(self, job, fn, args, kwargs):
+        job.status = RUNNING
+        job.started = time.time()
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.status = DONE
+        except Exception as exc:
+            job.error = f"{type(exc).__name__}: {exc}"
+            job.status = FAILED
+        finally:
+            job.finished = time.time()
+            job._finished.set()
+
+    def _evict(self):
+        now = time.time()
+        finished = sorted((job for job in self._jobs.values() if not job.active), key=lambda job: job.finished)
+        overflow = len(finished) - self.max_retained
+        for i, job in enumerate(finished):
+            if i < overflow or now - job.finished > self.ttl:
+                del self._jobs[job.id]
+
+
+# The DOCX stack (python-docx, lxml) is imported by the job bodies rather than at module level, so the
+# UI can create a JobManager on a cold start without paying for it; the first job loads it on its worker.
+def _render_docx(data, codes, low_memory, memory, limiter, backend, metrics, on_progress, details, part_pool):
+    from docx import Document
+
+    from .docx_pipeline import extract_document, render_translations
+    from .parallel import parallel_texts, render_parts, write_rendered
+    from .streaming import stream_texts, stream_write
+
+    if part_pool is not None:
+        with metrics.stage("extract"):
+            parts, texts_by_part, texts = parallel_texts(BytesIO(data), part_pool)
+    elif low_memory:
+        with metrics.stage("extract"):
+            texts = stream_texts(BytesIO(data))
+    else:
+        with metrics.stage("parse"):
+            doc = Document(BytesIO(data))
+        with metrics.stage("extract"):
+            segments = extract_document(doc)
+        texts = segments.texts()
+    details["segments"] = len(texts)
+    with metrics.stage("translate"):
+        translations = translate_batch_multi(texts, list(codes), on_progress=on_progress, memory=memory,
+                                             limiter=limiter, backend=backend, metrics=metrics)
+    if part_pool is not None:
+        with metrics.stage("save"):
+            rendered = render_parts(parts, texts_by_part,
+                                    {code: dict(zip(texts, translations[code])) for code in codes}, part_pool)
+        for code in codes:
+            output = BytesIO()
+            with metrics.stage("save"):
+                write_rendered(BytesIO(data), output, rendered[code])
+            yield code, output.getvalue()
+        return
+    if not low_memory:
+        yield from render_translations(doc, segments, translations, metrics)
+        return
+    for code in codes:
+        output = BytesIO()
+        with metrics.stage("save"):
+            stream_write(BytesIO(data), output, dict(zip(texts, translations[code])))
+        yield code, output.getvalue()
+
+
+def translate_docx_job(job, data, codes, low_memory=False, memory=None, limiter=None, backend=None, cache=None,
+                       part_pool=None):
+    from .docx_pipeline import output_name, zip_outputs
+
+    backend = backend or get_backend()
+    job.details["codes"] = codes
+    digest = content_digest(data)
+    # The parallel mode runs the streaming writer per part, so its output is byte-identical to low-memory mode.
+    mode = "docx-stream" if low_memory or part_pool is not None else "docx"
+    keys = {code: result_key(digest, code, backend.name, mode) for code in codes}
+    rendered = {}
+    if cache is not None:
+        for code, key in keys.items():
+            data_out = cache.get(key)
+            if data_out is not None:
+                rendered[code] = data_out
+    job.details["cached"] = len(rendered)
+    missing = [code for code in codes if code not in rendered]
+    if missing:
+        for code, data_out in _render_docx(data, missing, low_memory, memory, limiter, backend, job.metrics,
+                                          job.progress.update, job.details, part_pool):
+            rendered[code] = data_out
+            # Like the translation memory, never keep output that fell back to untranslated source text.
+            if cache is not None and not job.metrics.fallbacks_by_target.get(code):
+                cache.put(keys[code], data_out)
+    outputs = {output_name(label): rendered[code] for code, label in codes.items()}
+    if len(outputs) == 1:
+        return next(iter(outputs.items())) + (DOCX_MIME,)
+    return "translated_documents.zip", zip_outputs(outputs), "application/zip"
+
+
+def translate_revision_job(job, data, previous_source, previous_translation, code, label, memory=None,
+                           limiter=None, backend=None):
+    from docx import Document
+
+    from .docx_pipeline import extract_document, output_name, render_translations
+    from .revision import PriorTranslationMemory, align_translations, revision_report
+
+    metrics = job.metrics
+    job.details["codes"] = {code: label}
+    with metrics.stage("parse"):
+        doc = Document(BytesIO(data))
+        old_doc = Document(BytesIO(previous_source))
+        old_translated = Document(BytesIO(previous_translation))
+    with metrics.stage("extract"):
+        segments = extract_document(doc)
+        old_texts = extract_document(old_doc).texts()
+        prior, skipped_parts = align_translations(old_doc, old_translated)
+    texts = segments.texts()
+    job.details["segments"] = len(texts)
+    revision_memory = PriorTranslationMemory(prior, code, memory)
+    with metrics.stage("translate"):
+        translations = translate_batch_multi(texts, [code], on_progress=job.progress.update, memory=revision_memory,
+                                             limiter=limiter, backend=backend, metrics=metrics)
+    job.details["revision"] = revision_report(old_texts, texts, revision_memory.reused, skipped_parts)
+    _, output = next(render_translations(doc, segments, translations, metrics))
+    return output_name(label), output, DOCX_MIME
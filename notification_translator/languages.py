@@ -0,0 +1,53 @@
+languages = {
+    "India – Hindi": "hi",
+    "India – Tamil": "ta",
+    "India – Telugu": "te",
+    "India – Kannada": "kn",
+    "India – Malayalam": "ml",
+    "India – Gujarati": "gu",
+    "France – French": "fr",
+    "United Kingdom – English": "en",
+    "Poland – Polish": "pl",
+    "Sweden – Swedish": "sv",
+    "Finland – Finnish": "fi",
+    "Italy – Italian": "it",
+    "Japan – Japanese": "ja",
+    "Netherlands – Dutch": "nl",
+    "Germany – German": "de",
+    "South Korea – Korean": "ko",
+    "Australia – English": "en",
+    "USA – English": "en",
+    "Greece – Greek": "el",
+    "Philippines – Filipino": "tl",
+    "Egypt – Arabic": "ar",
+    "Austria – German": "de",
+    "South Africa – Afrikaans": "af",
+    "Canada – English": "en",
+    "Ireland – Irish (Gaelic)": "ga",
+    "Curaçao – Dutch": "nl",
+    "Belgium – Dutch": "nl",
+    "International Waters – English": "en",
+    "Taiwan – Mandarin Chinese": "zh-TW",
+    "China – Chinese (Simplified)": "zh-CN",
+    "Czech Republic – Czech": "cs",
+    "Spain – Spanish": "es",
+    "Mexico – Spanish": "es",
+    "Brazil – Portuguese": "pt",
+    "Turkey – Turkish": "tr",
+    "Argentina – Spanish": "es",
+    "Lithuania – Lithuanian": "lt",
+    "Portugal – Portuguese": "pt",
+    "Romania – Romanian": "ro",
+    "Cyprus – Greek": "el",
+    "Estonia – Estonian": "et",
+    "Denmark – Danish": "da",
+    "Croatia – Croatian": "hr",
+}
+language_labels = tuple(languages)
+
+
+def target_codes(labels):
+    codes = {}
+    for label in labels:
+        codes.setdefault(languages[label], label)
+    return codes
@@ -0,0 +1,90 @@
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from .glossary import glossary_version
+
+TRANSLATION_MEMORY_PATH = os.environ.get("TRANSLATION_MEMORY_PATH", ".translation_memory.sqlite3")
+TRANSLATION_MEMORY_MAX_ENTRIES = int(os.environ.get("TRANSLATION_MEMORY_MAX_ENTRIES", "50000"))
+
+
+def normalize_source(text):
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class TranslationMemory:
+    def __init__(self, path=TRANSLATION_MEMORY_PATH, max_entries=TRANSLATION_MEMORY_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS memory ("
+                " source TEXT NOT NULL, target TEXT NOT NULL, version TEXT NOT NULL,"
+                " translation TEXT NOT NULL, last_used REAL NOT NULL,"
+                " PRIMARY KEY (source, target, version))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS memory_last_used ON memory (last_used)")
+
+    def get_many(self, texts, target_lang, backend="google"):
+        version = f"{glossary_version(target_lang)}@{backend}"
+        found = {}
+        with self._lock, self._conn:
+            for text in texts:
+                row = self._conn.execute(
+                    "SELECT translation FROM memory WHERE source = ? AND target = ? AND version = ?",
+                    (normalize_source(text), target_lang, version),
+                ).fetchone()
+                if row:
+                    found[text] = row[0]
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE memory SET last_used = ? WHERE source = ? AND target = ? AND version = ?",
+                    [(now, normalize_source(t), target_lang, version) for t in found],
+                )
+            self.hits += len(found)
+            self.misses += len(texts) - len(found)
+        return found
+
+    def contains_many(self, texts, target_lang, backend="google"):
+        version = f"{glossary_version(target_lang)}@{backend}"
+        with self._lock:
+            return {
+                text for text in texts
+                if self._conn.execute(
+                    "SELECT 1 FROM memory WHERE source = ? AND target = ? AND version = ?",
+                    (normalize_source(text), target_lang, version),
+                ).fetchone()
+            }
+
+    def put_many(self, translations, target_lang, backend="google"):
+        version = f"{glossary_version(target_lang)}@{backend}"
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO memory (source, target, version, translation, last_used)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(normalize_source(src), target_lang, version, out, now) for src, out in translations.items()],
+            )
+            excess = self._count() - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM memory WHERE rowid IN"
+                    " (SELECT rowid FROM memory ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+
+    def _count(self):
+        return self._conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            entries = self._count()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
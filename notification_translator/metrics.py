@@ -0,0 +1,123 @@
+from contextlib import contextmanager
+import threading
+import time
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+FALLBACK_REPORT_LIMIT = 200
+FALLBACK_PREVIEW_CHARS = 80
+
+
+class JobMetrics:
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.fallbacks = 0
+        self.fallback_details = []
+        self.fallbacks_by_target = {}
+        self.chars_sent = 0
+        self.glossary_substitutions = 0
+        self.source_language = None
+        self.skipped = 0
+        self.latency_total = 0.0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.errors = {}
+        self.error_kinds = {}
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def record_call(self, seconds, chars, error=None, kind=None):
+        bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound), len(LATENCY_BUCKETS))
+        with self._lock:
+            self.calls += 1
+            self.chars_sent += chars
+            self.latency_total += seconds
+            self.latency_buckets[bucket] += 1
+            if error is not None:
+                self.failures += 1
+                name = type(error).__name__
+                self.errors[name] = self.errors.get(name, 0) + 1
+                if kind is not None:
+                    self.error_kinds[kind] = self.error_kinds.get(kind, 0) + 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_fallbacks(self, target_lang, texts, reason):
+        with self._lock:
+            self.fallbacks += len(texts)
+            self.fallbacks_by_target[target_lang] = self.fallbacks_by_target.get(target_lang, 0) + len(texts)
+            room = FALLBACK_REPORT_LIMIT - len(self.fallback_details)
+            self.fallback_details.extend(
+                {"target": target_lang, "reason": reason, "text": text[:FALLBACK_PREVIEW_CHARS]}
+                for text in texts[:max(room, 0)]
+            )
+
+    def record_source(self, source, skipped):
+        with self._lock:
+            self.source_language = source
+            self.skipped += skipped
+
+    def record_glossary(self, count):
+        with self._lock:
+            self.glossary_substitutions += count
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def latency_histogram(self):
+        labels = [f"<={bound:g}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]:g}s"]
+        return dict(zip(labels, self.latency_buckets))
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "translator_calls": self.calls,
+                "translator_failures": self.failures,
+                "translator_retries": self.retries,
+                "errors": dict(self.errors),
+                "error_kinds": dict(self.error_kinds),
+                "fallback_segments": self.fallbacks,
+                "fallbacks": list(self.fallback_details),
+                "chars_sent": self.chars_sent,
+                "glossary_substitutions": self.glossary_substitutions,
+                "source_language": self.source_language,
+                "skipped_segments": self.skipped,
+                "latency_mean_s": round(self.latency_total / self.calls, 4) if self.calls else None,
+                "latency_histogram": self.latency_histogram(),
+                "stages_s": {name: round(seconds, 4) for name, seconds in self.stages.items()},
+            }
+
+
+class ProgressTracker:
+    def __init__(self):
+        self.done = 0
+        self.total = 0
+        self.started = None
+        self._baseline = 0
+
+    def update(self, done, total):
+        if self.started is None:
+            self.started, self._baseline = time.perf_counter(), done
+        self.done, self.total = done, total
+
+    def snapshot(self):
+        elapsed = time.perf_counter() - self.started if self.started is not None else 0.0
+        rate = (self.done - self._baseline) / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.total - self.done, 0)
+        return {
+            "done": self.done,
+            "total": self.total,
+            "fraction": min(self.done / self.total, 1.0) if self.total else 0.0,
+            "elapsed_s": elapsed,
+            "chars_per_s": rate,
+            "eta_s": remaining / rate if rate > 0 else None,
+        }
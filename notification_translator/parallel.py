@@ -0,0 +1,89 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from io import BytesIO
+import multiprocessing
+import os
+import zipfile
+
+from .translate import translate_batch_multi
+
+PART_WORKERS = int(os.environ.get("PART_WORKERS", str(os.cpu_count() or 1)))
+
+
+def part_pool(workers=PART_WORKERS):
+    # spawn, not fork: pools are created from threaded hosts (Streamlit, job workers) where fork is unsafe.
+    return ProcessPoolExecutor(max_workers=max(1, workers), mp_context=multiprocessing.get_context("spawn"))
+
+
+# The streaming module (python-docx, lxml) is imported inside the functions so the app can create
+# the pool at start-up without loading it; spawned workers import it with their first task.
+def read_parts(source):
+    from .streaming import story_parts
+
+    with zipfile.ZipFile(source) as zin:
+        return {name: zin.read(name) for name in story_parts(zin)}
+
+
+def _largest_first(parts):
+    return sorted(parts, key=lambda name: len(parts[name]), reverse=True)
+
+
+def _extract_part(name, xml):
+    from .streaming import part_texts
+
+    return part_texts(BytesIO(xml), name)
+
+
+def _render_part(name, xml, translations):
+    from .streaming import write_part
+
+    output = BytesIO()
+    write_part(BytesIO(xml), output, name, translations)
+    return output.getvalue()
+
+
+def extract_parts(parts, pool):
+    futures = {name: pool.submit(_extract_part, name, parts[name]) for name in _largest_first(parts)}
+    return {name: futures[name].result() for name in parts}
+
+
+def render_parts(parts, texts_by_part, translations, pool):
+    futures = {}
+    for name in _largest_first(parts):
+        for code, mapping in translations.items():
+            needed = {t: mapping[t] for t in texts_by_part[name] if t in mapping}
+            futures[code, name] = pool.submit(_render_part, name, parts[name], needed)
+    return {code: {name: futures[code, name].result() for name in parts} for code in translations}
+
+
+def write_rendered(source, output, rendered):
+    from .streaming import rewrite_package
+
+    rewrite_package(source, output, lambda src, dst, name: dst.write(rendered[name]))
+
+
+def parallel_texts(source, pool):
+    parts = read_parts(source)
+    texts_by_part = extract_parts(parts, pool)
+    return parts, texts_by_part, [t for name in parts for t in texts_by_part[name]]
+
+
+def translate_docx_parallel(source, outputs, on_progress=None, memory=None, limiter=None, backend=None,
+                            metrics=None, pool=None):
+    own_pool = pool is None
+    pool = pool or part_pool()
+    try:
+        with metrics.stage("extract") if metrics else nullcontext():
+            parts, texts_by_part, texts = parallel_texts(source, pool)
+        with metrics.stage("translate") if metrics else nullcontext():
+            translations = translate_batch_multi(texts, list(outputs), on_progress=on_progress, memory=memory,
+                                                 limiter=limiter, backend=backend, metrics=metrics)
+        with metrics.stage("save") if metrics else nullcontext():
+            rendered = render_parts(parts, texts_by_part,
+                                    {code: dict(zip(texts, translations[code])) for code in outputs}, pool)
+            for code, output in outputs.items():
+                write_rendered(source, output, rendered[code])
+    finally:
+        if own_pool:
+            pool.shutdown()
+    return texts
@@ -0,0 +1,78 @@
+from io import BytesIO
+import math
+import os
+import time
+
+from .backends import get_backend
+from .cache import content_digest, result_key
+from .translate import BATCH_SEPARATOR, TRANSLATE_MAX_IN_FLIGHT, plan_batches, select_texts
+
+PLAN_ASSUMED_LATENCY = float(os.environ.get("PLAN_ASSUMED_LATENCY", "1.0"))
+
+
+def estimate_seconds(requests, latency, max_in_flight=TRANSLATE_MAX_IN_FLIGHT, rate=0.0):
+    if not requests:
+        return 0.0
+    seconds = math.ceil(requests / max(1, min(max_in_flight, requests))) * latency
+    if rate > 0:
+        seconds = max(seconds, requests / rate)
+    return seconds
+
+
+def plan_translation(texts, target_langs, memory=None, limiter=None, backend=None,
+                     max_in_flight=TRANSLATE_MAX_IN_FLIGHT, source="auto"):
+    backend = backend or get_backend()
+    unique, linguistic, source = select_texts(texts, source)
+    known = {
+        lang: memory.contains_many(linguistic, lang, backend.name) if memory and lang != source else set()
+        for lang in target_langs
+    }
+    protected, jobs = plan_batches(linguistic, target_langs, source, known)
+    targets = {
+        lang: {"same_as_source": lang == source, "memory_hits": len(known[lang]), "segments": 0, "requests": 0,
+               "chars": 0}
+        for lang in target_langs
+    }
+    for lang, sources in jobs:
+        target = targets[lang]
+        target["segments"] += len(sources)
+        target["requests"] += 1
+        target["chars"] += len(BATCH_SEPARATOR.join(protected[t][0] for t in sources))
+    latency = backend.observed_latency
+    rate = limiter.rate if limiter else 0.0
+    return {
+        "segments": len(texts),
+        "unique_segments": len(unique),
+        "skipped_segments": len(unique) - len(linguistic),
+        "source_language": source,
+        "targets": targets,
+        "requests": len(jobs),
+        "chars_to_send": sum(target["chars"] for target in targets.values()),
+        "latency_s": round(latency or PLAN_ASSUMED_LATENCY, 3),
+        "latency_basis": "observed" if latency is not None else "assumed",
+        "rate_per_sec": rate,
+        "estimated_seconds": round(estimate_seconds(len(jobs), latency or PLAN_ASSUMED_LATENCY, max_in_flight,
+                                                    rate), 1),
+    }
+
+
+def plan_docx(data, codes, low_memory=False, memory=None, limiter=None, backend=None, cache=None):
+    from docx import Document
+
+    from .docx_pipeline import extract_document
+    from .streaming import stream_texts
+
+    start = time.perf_counter()
+    backend = backend or get_backend()
+    digest = content_digest(data)
+    mode = "docx-stream" if low_memory else "docx"
+    cached = [code for code in codes if cache is not None and result_key(digest, code, backend.name, mode) in cache]
+    if low_memory:
+        texts = stream_texts(BytesIO(data))
+    else:
+        texts = extract_document(Document(BytesIO(data))).texts()
+    plan = plan_translation(texts, [code for code in codes if code not in cached], memory, limiter, backend)
+    plan["cached_targets"] = cached
+    plan["document_bytes"] = len(data)
+    plan["planning_seconds"] = round(time.perf_counter() - start, 3)
+    return plan
@@ -0,0 +1,88 @@
+import os
+import random
+import threading
+import time
+
+TRANSLATE_MAX_RETRIES = int(os.environ.get("TRANSLATE_MAX_RETRIES", "4"))
+TRANSLATE_BACKOFF_BASE = float(os.environ.get("TRANSLATE_BACKOFF_BASE", "0.5"))
+TRANSLATE_BACKOFF_CAP = float(os.environ.get("TRANSLATE_BACKOFF_CAP", "20"))
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.environ.get("BREAKER_RESET_SECONDS", "30"))
+
+RATE_LIMIT, TIMEOUT, TOO_LARGE = "rate_limit", "timeout", "too_large"
+NOT_FOUND, UNAVAILABLE, CIRCUIT_OPEN, FATAL = "not_found", "unavailable", "circuit_open", "error"
+RETRYABLE = {RATE_LIMIT, TIMEOUT, UNAVAILABLE}
+BREAKER_FAILURES = {TIMEOUT, UNAVAILABLE}
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+def classify_error(exc):
+    if isinstance(exc, CircuitOpenError):
+        return CIRCUIT_OPEN
+    import requests
+    from deep_translator.exceptions import NotValidLength, RequestError, TooManyRequests, TranslationNotFound
+
+    if isinstance(exc, TooManyRequests):
+        return RATE_LIMIT
+    if isinstance(exc, NotValidLength):
+        return TOO_LARGE
+    if isinstance(exc, (requests.Timeout, TimeoutError)):
+        return TIMEOUT
+    if isinstance(exc, TranslationNotFound):
+        return NOT_FOUND
+    if isinstance(exc, (RequestError, requests.ConnectionError, ConnectionError)):
+        return UNAVAILABLE
+    return FATAL
+
+
+def backoff_delay(attempt, base=TRANSLATE_BACKOFF_BASE, cap=TRANSLATE_BACKOFF_CAP):
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    def __init__(self, threshold=BREAKER_FAILURE_THRESHOLD, reset_after=BREAKER_RESET_SECONDS):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        return "open" if time.monotonic() - self.opened_at < self.reset_after else "half-open"
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_after or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+    def record_error(self):
+        # Errors that say nothing about availability (rate limits, bad input) still end a half-open probe;
+        # left unreleased, the probe flag would keep the breaker closed to every later call.
+        with self._lock:
+            if self._probing:
+                self.opened_at = time.monotonic()
+                self._probing = False
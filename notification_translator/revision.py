@@ -0,0 +1,89 @@
+from difflib import SequenceMatcher
+
+from .docx_pipeline import extract_document
+
+REVISION_REPORT_LIMIT = 50
+REVISION_PREVIEW_CHARS = 120
+
+
+def _texts_by_part(segments):
+    parts = {}
+    for seg in segments.segments:
+        parts.setdefault(seg.part, []).append(seg.text)
+    return parts
+
+
+def align_translations(source_doc, translated_doc):
+    translated = _texts_by_part(extract_document(translated_doc))
+    prior, skipped_parts = {}, []
+    for part, texts in _texts_by_part(extract_document(source_doc)).items():
+        targets = translated.get(part, [])
+        if len(targets) != len(texts):
+            skipped_parts.append(part)
+            continue
+        for source, target in zip(texts, targets):
+            prior.setdefault(source, target)
+    return prior, skipped_parts
+
+
+class PriorTranslationMemory:
+    def __init__(self, prior, target_lang, memory=None):
+        self.prior = prior
+        self.target_lang = target_lang
+        self.memory = memory
+        self.reused = set()
+
+    def get_many(self, texts, target_lang, backend="google"):
+        found = {}
+        if target_lang == self.target_lang:
+            found = {t: self.prior[t] for t in texts if t in self.prior}
+            self.reused.update(found)
+        rest = [t for t in texts if t not in found]
+        if self.memory is not None and rest:
+            found.update(self.memory.get_many(rest, target_lang, backend))
+        return found
+
+    def contains_many(self, texts, target_lang, backend="google"):
+        found = {t for t in texts if t in self.prior} if target_lang == self.target_lang else set()
+        rest = [t for t in texts if t not in found]
+        if self.memory is not None and rest:
+            found |= self.memory.contains_many(rest, target_lang, backend)
+        return found
+
+    def put_many(self, translations, target_lang, backend="google"):
+        if self.memory is not None:
+            self.memory.put_many(translations, target_lang, backend)
+
+
+def _preview(texts):
+    return [text[:REVISION_PREVIEW_CHARS] for text in texts]
+
+
+def revision_report(old_texts, new_texts, reused, skipped_parts=()):
+    counts = {"unchanged": 0, "modified": 0, "added": 0, "removed": 0}
+    changes = []
+    matcher = SequenceMatcher(None, old_texts, new_texts, autojunk=False)
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            counts["unchanged"] += i2 - i1
+            continue
+        if op == "replace":
+            counts["modified"] += max(i2 - i1, j2 - j1)
+        elif op == "insert":
+            counts["added"] += j2 - j1
+        else:
+            counts["removed"] += i2 - i1
+        if len(changes) < REVISION_REPORT_LIMIT:
+            changes.append({"op": op, "position": j1, "old": _preview(old_texts[i1:i2]),
+                            "new": _preview(new_texts[j1:j2])})
+    new_chars = sum(len(t) for t in new_texts) or 1
+    old = set(old_texts)
+    changed = [t for t in new_texts if t not in old]
+    return {
+        **counts,
+        "segments": len(new_texts),
+        "reused_translations": len(reused),
+        "changed_chars_pct": round(100 * sum(len(t) for t in changed) / new_chars, 2),
+        "unaligned_parts": list(skipped_parts),
+        "changes": changes,
+    }
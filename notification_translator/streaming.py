@@ -0,0 +1,153 @@
+from contextlib import nullcontext
+import posixpath
+import re
+import shutil
+import zipfile
+
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml import parser as oxml_parser
+from docx.oxml.ns import qn
+from lxml import etree
+
+from .docx_pipeline import SegmentTable, extract_block, lock_table_layout, write_segments
+from .translate import translate_batch_multi
+
+PKG_RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+W_BODY = qn("w:body")
+STORY_RELTYPES = {RT.HEADER, RT.FOOTER, RT.FOOTNOTES, RT.ENDNOTES}
+COPY_BUFFER = 1 << 20
+XML_DECLARATION = b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+XMLNS_RE = re.compile(rb' xmlns(?::[\w.-]+)?="[^"]*"')
+# Rewritten parts can outgrow their source, so Zip64 headers are forced well before the limit.
+ZIP64_THRESHOLD = zipfile.ZIP64_LIMIT // 2
+
+
+def _read_rels(zin, rels_name, base):
+    try:
+        root = etree.fromstring(zin.read(rels_name))
+    except KeyError:
+        return
+    for rel in root.iterchildren(f"{{{PKG_RELS_NS}}}Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target")
+        target = target[1:] if target.startswith("/") else posixpath.normpath(posixpath.join(base, target))
+        yield rel.get("Type"), target
+
+
+def story_parts(zin):
+    main = next((t for rtype, t in _read_rels(zin, "_rels/.rels", "") if rtype == RT.OFFICE_DOCUMENT), None)
+    if main is None:
+        raise ValueError("not a WordprocessingML package: no main document part")
+    base, name = posixpath.split(main)
+    parts = [main] + [t for rtype, t in _read_rels(zin, posixpath.join(base, "_rels", name + ".rels"), base)
+                      if rtype in STORY_RELTYPES]
+    names = set(zin.namelist())
+    return [p for p in dict.fromkeys(parts) if p in names]
+
+
+def _tag_pair(el, declared):
+    shell = etree.tostring(etree.Element(el.tag, attrib=dict(el.attrib), nsmap=el.nsmap))
+    head = XMLNS_RE.sub(lambda m: b"" if m.group(0) in declared else m.group(0), shell[:-2])
+    name = re.match(rb"<([^\s/>]+)", shell).group(1)
+    return head + b">", b"</" + name + b">", set(XMLNS_RE.findall(shell))
+
+
+def _serialize_block(el, declared):
+    xml = etree.tostring(el, with_tail=False)
+    end = xml.index(b">")
+    return XMLNS_RE.sub(lambda m: b"" if m.group(0) in declared else m.group(0), xml[:end]) + xml[end:]
+
+
+def iter_blocks(stream, out=None):
+    context = etree.iterparse(stream, events=("start", "end"), remove_blank_text=True,
+                              resolve_entities=False, huge_tree=True)
+    context.set_element_class_lookup(oxml_parser.element_class_lookup)
+    containers, end_tags, declared = [], [], set()
+    for event, el in context:
+        if event == "start":
+            is_container = not containers or (containers[-1] and el.tag == W_BODY)
+            containers.append(is_container)
+            if is_container and out is not None:
+                start_tag, end_tag, declarations = _tag_pair(el, declared)
+                declared = declared or declarations
+                out.write(start_tag)
+                end_tags.append(end_tag)
+            continue
+        is_container = containers.pop()
+        if is_container:
+            if out is not None:
+                out.write(end_tags.pop())
+        elif containers and containers[-1]:
+            yield el
+            if out is not None:
+                out.write(_serialize_block(el, declared))
+            parent = el.getparent()
+            el.clear()
+            while el.getprevious() is not None:
+                del parent[0]
+
+
+def part_texts(stream, name):
+    texts = []
+    for block in iter_blocks(stream):
+        table = SegmentTable()
+        extract_block(block, name, table)
+        texts.extend(table.texts())
+    return texts
+
+
+def stream_texts(source):
+    texts = []
+    with zipfile.ZipFile(source) as zin:
+        for name in story_parts(zin):
+            with zin.open(name) as stream:
+                texts.extend(part_texts(stream, name))
+    return texts
+
+
+def _copy_info(info):
+    copy = zipfile.ZipInfo(info.filename, info.date_time)
+    copy.compress_type = info.compress_type
+    copy.external_attr = info.external_attr
+    copy.create_system = info.create_system
+    return copy
+
+
+def write_part(src, dst, name, translations):
+    dst.write(XML_DECLARATION)
+    for block in iter_blocks(src, dst):
+        table = SegmentTable()
+        extract_block(block, name, table)
+        write_segments(table, [translations.get(t, t) for t in table.texts()])
+        for tbl in table.tables:
+            lock_table_layout(tbl)
+
+
+def rewrite_package(source, output, rewrite):
+    with zipfile.ZipFile(source) as zin, zipfile.ZipFile(output, "w") as zout:
+        parts = set(story_parts(zin))
+        for info in zin.infolist():
+            zip64 = info.file_size >= ZIP64_THRESHOLD
+            with zin.open(info) as src, zout.open(_copy_info(info), "w", force_zip64=zip64) as dst:
+                if info.filename in parts:
+                    rewrite(src, dst, info.filename)
+                else:
+                    shutil.copyfileobj(src, dst, COPY_BUFFER)
+
+
+def stream_write(source, output, translations):
+    rewrite_package(source, output, lambda src, dst, name: write_part(src, dst, name, translations))
+
+
+def translate_docx_stream(source, outputs, on_progress=None, memory=None, limiter=None,
+                          backend=None, metrics=None):
+    with metrics.stage("extract") if metrics else nullcontext():
+        texts = stream_texts(source)
+    with metrics.stage("translate") if metrics else nullcontext():
+        translations = translate_batch_multi(texts, list(outputs), on_progress=on_progress, memory=memory,
+                                             limiter=limiter, backend=backend, metrics=metrics)
+    for code, output in outputs.items():
+        with metrics.stage("save") if metrics else nullcontext():
+            stream_write(source, output, dict(zip(texts, translations[code])))
+    return texts
@@ -0,0 +1,306 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+import re
+import threading
+import time
+
+from .backends import TRANSLATE_MAX_IN_FLIGHT, get_backend
+from .detect import detect_language, is_linguistic
+from .glossary import PRESERVE_RE, apply_wind_glossary_counted, protect_text, restore_text
+from .resilience import (
+    BREAKER_FAILURES,
+    NOT_FOUND,
+    RATE_LIMIT,
+    RETRYABLE,
+    TOO_LARGE,
+    TRANSLATE_MAX_RETRIES,
+    CircuitOpenError,
+    backoff_delay,
+    classify_error,
+)
+
+
+BATCH_CHAR_LIMIT = 4500
+BATCH_SEPARATOR = "\n"
+TRANSLATE_RATE_PER_SEC = float(os.environ.get("TRANSLATE_RATE_PER_SEC", "10"))
+TRANSLATE_MIN_RATE_PER_SEC = float(os.environ.get("TRANSLATE_MIN_RATE_PER_SEC", "0.5"))
+RATE_INCREASE_PER_SUCCESS = 0.1
+STREAM_CHUNK_CHARS = 800
+SENTENCE_BREAK_RE = re.compile(r"(?<=[.!?;:。！？])\s+")
+WORD_BREAK_RE = re.compile(r"\s+")
+
+
+class TokenBucket:
+    def __init__(self, rate=TRANSLATE_RATE_PER_SEC, capacity=None, min_rate=TRANSLATE_MIN_RATE_PER_SEC):
+        self.rate = rate
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.capacity = capacity or max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def throttled(self):
+        with self._lock:
+            if self.rate > 0:
+                self.rate = max(self.min_rate, self.rate / 2)
+                self._tokens = min(self._tokens, 0.0)
+
+    def succeeded(self):
+        with self._lock:
+            if 0 < self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + RATE_INCREASE_PER_SUCCESS)
+
+
+def call_backend(text, target_lang, limiter=None, backend=None, metrics=None, retries=TRANSLATE_MAX_RETRIES,
+                 source="auto"):
+    backend = backend or get_backend()
+    for attempt in range(retries + 1):
+        if not backend.breaker.allow():
+            raise CircuitOpenError(f"{backend.name} translator is unavailable")
+        if limiter:
+            limiter.acquire()
+        start = time.perf_counter()
+        try:
+            translated = backend.translate(text, target_lang, source)
+        except Exception as exc:
+            kind = classify_error(exc)
+            if metrics:
+                metrics.record_call(time.perf_counter() - start, len(text), exc, kind)
+            if kind in BREAKER_FAILURES:
+                backend.breaker.record_failure()
+            else:
+                backend.breaker.record_error()
+            if kind == RATE_LIMIT and limiter:
+                limiter.throttled()
+            if kind not in RETRYABLE or attempt == retries:
+                raise
+            if metrics:
+                metrics.record_retry()
+            time.sleep(backoff_delay(attempt))
+            continue
+        elapsed = time.perf_counter() - start
+        if metrics:
+            metrics.record_call(elapsed, len(text))
+        backend.breaker.record_success()
+        backend.observe_latency(elapsed)
+        if limiter:
+            limiter.succeeded()
+        return translated
+
+
+def translate_chunk(texts, target_lang, limiter=None, backend=None, metrics=None, source="auto"):
+    backend = backend or get_backend()
+    try:
+        translated = call_backend(BATCH_SEPARATOR.join(texts), target_lang, limiter, backend, metrics, source=source)
+    except Exception as exc:
+        kind = classify_error(exc)
+        if kind == TOO_LARGE and len(texts) > 1:
+            mid = len(texts) // 2
+            return (translate_chunk(texts[:mid], target_lang, limiter, backend, metrics, source)
+                    + translate_chunk(texts[mid:], target_lang, limiter, backend, metrics, source))
+        if kind == NOT_FOUND and len(texts) > 1:
+            return [translate_chunk([t], target_lang, limiter, backend, metrics, source)[0] for t in texts]
+        if metrics:
+            metrics.record_fallbacks(target_lang, texts, kind)
+        return [None] * len(texts)
+    if len(texts) == 1:
+        if not translated and metrics:
+            metrics.record_fallbacks(target_lang, texts, "empty")
+        return [translated or None]
+    if translated:
+        parts = translated.split(BATCH_SEPARATOR)
+        if len(parts) == len(texts):
+            return parts
+    return [translate_chunk([t], target_lang, limiter, backend, metrics, source)[0] for t in texts]
+
+
+def pack_batches(texts, limit=BATCH_CHAR_LIMIT):
+    batch, size = [], 0
+    for i, text in enumerate(texts):
+        if BATCH_SEPARATOR in text or len(text) >= limit:
+            yield [i]
+            continue
+        if batch and size + len(BATCH_SEPARATOR) + len(text) > limit:
+            yield batch
+            batch, size = [], 0
+        size += len(text) + (len(BATCH_SEPARATOR) if batch else 0)
+        batch.append(i)
+    if batch:
+        yield batch
+
+
+def select_texts(texts, source="auto"):
+    unique = list(dict.fromkeys(t for t in texts if t and t.strip()))
+    linguistic = [t for t in unique if is_linguistic(t)]
+    if source == "auto":
+        source = detect_language(linguistic) or "auto"
+    return unique, linguistic, source
+
+
+def plan_batches(linguistic, target_langs, source, known):
+    protected, jobs = {}, []
+    for lang in target_langs:
+        if lang == source:
+            continue
+        pending = [t for t in linguistic if t not in known[lang]]
+        for t in pending:
+            if t not in protected:
+                protected[t] = protect_text(t)
+        for batch in pack_batches([protected[t][0] for t in pending]):
+            jobs.append((lang, [pending[i] for i in batch]))
+    return protected, jobs
+
+
+def translate_batch_multi(texts, target_langs, on_progress=None, memory=None, limiter=None,
+                          max_in_flight=TRANSLATE_MAX_IN_FLIGHT, backend=None, metrics=None, source="auto"):
+    backend = backend or get_backend()
+    # The detected language only decides which targets to skip; requests keep the caller's source so a
+    # wrong guess cannot mistranslate a whole document.
+    unique, linguistic, detected = select_texts(texts, source)
+    if metrics:
+        metrics.record_source(detected, len(unique) - len(linguistic))
+    results = {
+        lang: memory.get_many(linguistic, lang, backend.name) if memory and lang != detected else {}
+        for lang in target_langs
+    }
+    fresh = {lang: {} for lang in target_langs}
+    protected, jobs = plan_batches(linguistic, target_langs, detected, results)
+    total = sum(len(t) for t in unique) * len(target_langs)
+    done = total - sum(len(t) for _, sources in jobs for t in sources)
+    if on_progress:
+        on_progress(done, total)
+    if jobs:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_in_flight, len(jobs)))) as pool:
+            futures = {
+                pool.submit(translate_chunk, [protected[t][0] for t in sources], lang, limiter, backend, metrics,
+                            source):
+                    (lang, sources)
+                for lang, sources in jobs
+            }
+            for future in as_completed(futures):
+                lang, sources = futures[future]
+                substitutions = 0
+                for original, translated in zip(sources, future.result()):
+                    text, placeholders = protected[original]
+                    result, replaced = apply_wind_glossary_counted(restore_text(translated or text, placeholders), lang)
+                    results[lang][original] = result
+                    substitutions += replaced
+                    if translated is not None:
+                        fresh[lang][original] = result
+                if metrics:
+                    metrics.record_glossary(substitutions)
+                done += sum(len(t) for t in sources)
+                if on_progress:
+                    on_progress(done, total)
+    if memory:
+        for lang, translations in fresh.items():
+            if translations:
+                memory.put_many(translations, lang, backend.name)
+    for lang in target_langs:
+        substitutions = 0
+        for t in unique:
+            if t not in results[lang]:
+                results[lang][t], replaced = apply_wind_glossary_counted(t, lang)
+                substitutions += replaced
+        if metrics and substitutions:
+            metrics.record_glossary(substitutions)
+    return {lang: [results[lang].get(t, t) for t in texts] for lang in target_langs}
+
+
+def _last_break(breaks, pos, limit):
+    found = None
+    for m in breaks:
+        if m.start() > pos + limit:
+            break
+        if m.start() > pos:
+            found = m
+    return found
+
+
+def split_line(line, limit=BATCH_CHAR_LIMIT):
+    spans = [m.span() for m in PRESERVE_RE.finditer(line)]
+
+    def breaks(pattern):
+        return [m for m in pattern.finditer(line) if not any(a < m.end() and m.start() < b for a, b in spans)]
+
+    sentence_breaks, word_breaks = breaks(SENTENCE_BREAK_RE), breaks(WORD_BREAK_RE)
+    pieces, seps, pos = [], [], 0
+    while len(line) - pos > limit:
+        cut = _last_break(sentence_breaks, pos, limit) or _last_break(word_breaks, pos, limit)
+        if cut is None:
+            end = pos + limit
+            end = next((a for a, b in spans if a < end < b and a > pos), end)
+            pieces.append(line[pos:end])
+            seps.append("")
+            pos = end
+            continue
+        pieces.append(line[pos:cut.start()])
+        seps.append(cut.group())
+        pos = cut.end()
+    pieces.append(line[pos:])
+    seps.append("")
+    return pieces, seps
+
+
+def split_text(text, limit=BATCH_CHAR_LIMIT):
+    pieces, seps = [], []
+    lines = text.split("\n")
+    for i, line in enumerate(lines):
+        line_pieces, line_seps = split_line(line, limit)
+        line_seps[-1] = "\n" if i < len(lines) - 1 else ""
+        pieces.extend(line_pieces)
+        seps.extend(line_seps)
+    return pieces, seps
+
+
+def translate_batch(texts, target_lang, on_progress=None, memory=None, limiter=None,
+                    max_in_flight=TRANSLATE_MAX_IN_FLIGHT, backend=None, metrics=None):
+    return translate_batch_multi(texts, [target_lang], on_progress=on_progress, memory=memory, limiter=limiter,
+                                 max_in_flight=max_in_flight, backend=backend, metrics=metrics)[target_lang]
+
+
+def safe_translate(text, target_lang, memory=None, limiter=None, backend=None, metrics=None):
+    if not text or text.strip() == "":
+        return text
+    if len(text) <= BATCH_CHAR_LIMIT:
+        return translate_batch([text], target_lang, memory=memory, limiter=limiter, backend=backend,
+                               metrics=metrics)[0]
+    pieces, seps = split_text(text)
+    translated = translate_batch(pieces, target_lang, memory=memory, limiter=limiter, backend=backend,
+                                 metrics=metrics)
+    return "".join(piece + sep for piece, sep in zip(translated, seps))
+
+
+def iter_translate(text, target_lang, memory=None, limiter=None, backend=None, metrics=None,
+                   chunk_chars=STREAM_CHUNK_CHARS, max_in_flight=TRANSLATE_MAX_IN_FLIGHT):
+    if not text or text.strip() == "":
+        yield text
+        return
+    pieces, seps = split_text(text, chunk_chars)
+    groups = list(pack_batches(pieces, chunk_chars))
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_in_flight, len(groups))))
+    try:
+        futures = [
+            pool.submit(translate_batch, [pieces[i] for i in group], target_lang, memory=memory, limiter=limiter,
+                        max_in_flight=1, backend=backend, metrics=metrics)
+            for group in groups
+        ]
+        for group, future in zip(groups, futures):
+            yield "".join(translated + seps[i] for i, translated in zip(group, future.result()))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)